@@ -0,0 +1,47 @@
+"""Genera el manifiesto confiable de una carpeta de plantillas."""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+try:
+    from . import common
+except ImportError:  # pragma: no cover - permite ejecución directa como script
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parent))
+    import common  # type: ignore[no-redef]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Genera el manifiesto de la payload de plantillas (Python)")
+    parser.add_argument(
+        "payload",
+        nargs="?",
+        help="Carpeta de plantillas (por defecto se busca desde la carpeta actual).",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="RUTA",
+        help=f"Ruta del manifiesto (por defecto {common.PAYLOAD_MANIFEST_NAME} dentro de la payload).",
+    )
+    parser.add_argument("--jobs", type=int, default=common.DEFAULT_VALIDATION_JOBS, metavar="N")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    base_dir = Path(args.payload) if args.payload else common.resolve_base_directory(Path.cwd())
+    manifest = common.PayloadManifest.build(base_dir, jobs=args.jobs)
+    if args.output:
+        manifest.path = common.normalize_path(args.output)
+    if not manifest.entries:
+        print(f"[WARN] No se encontraron plantillas en \"{base_dir}\".")
+        return 1
+    manifest.save()
+    print(f"[OK] Manifiesto con {len(manifest.entries)} archivos: {manifest.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
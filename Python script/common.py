@@ -1,16 +1,30 @@
 """Funciones compartidas para instalar/desinstalar plantillas de Office."""
 from __future__ import annotations
 
+import errno
+import fnmatch
+import hashlib
+import io
+import json
 import logging
 import os
+import queue
+import re
 import shutil
+import struct
 import subprocess
 import sys
+import threading
+import time
+import uuid
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Iterable, Iterator, List, Optional, Set
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Set, TypeVar
 import xml.etree.ElementTree as ET
 
 
@@ -25,6 +39,11 @@ try:
 except Exception:  # pragma: no cover - entornos no Windows
     winreg = None  # type: ignore[assignment]
 
+try:
+    import fcntl
+except Exception:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
 LOGGER = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------- #
@@ -72,6 +91,15 @@ def _resolve_appdata_path() -> Path:
     return normalize_path(appdata or (Path.home() / "AppData" / "Roaming"))
 
 
+def _resolve_local_appdata_path() -> Path:
+    local_appdata = _read_registry_value(
+        r"Software\Microsoft\Windows\CurrentVersion\Explorer\User Shell Folders", "Local AppData"
+    )
+    if not local_appdata:
+        local_appdata = os.environ.get("LOCALAPPDATA")
+    return normalize_path(local_appdata or (Path.home() / "AppData" / "Local"))
+
+
 def _resolve_documents_path() -> Path:
     documents = _read_registry_value(
         r"Software\Microsoft\Windows\CurrentVersion\Explorer\User Shell Folders", "Personal"
@@ -144,6 +172,7 @@ def _resolve_base_paths() -> dict[str, Path]:
     appdata_path = _resolve_appdata_path()
     return {
         "APPDATA": appdata_path,
+        "LOCALAPPDATA": _resolve_local_appdata_path(),
         "DOCUMENTS": documents_path,
         "CUSTOM_WORD": custom_word,
         "CUSTOM_PPT": custom_ppt,
@@ -167,8 +196,30 @@ DEFAULT_ALLOWED_TEMPLATE_AUTHORS = [
 DEFAULT_DOCUMENT_THEME_DELAY_SECONDS = int(
     os.environ.get("DOCUMENT_THEME_OPEN_DELAY_SECONDS", "0") or 0
 )
+DEFAULT_VALIDATION_JOBS = max(1, int(os.environ.get("AUTHOR_VALIDATION_JOBS", "1") or 1))
 DEFAULT_DESIGN_MODE = os.environ.get("IsDesignModeEnabled", "false").lower() == "true"
 AUTHOR_VALIDATION_ENABLED = os.environ.get("AuthorValidationEnabled", "TRUE").lower() != "false"
+# Separar dc:creator con varios autores ("a; b", "a & b") y exigir que todos estén permitidos.
+SPLIT_MULTIPLE_AUTHORS = os.environ.get("SplitMultipleAuthors", "FALSE").lower() == "true"
+AUTHOR_CACHE_ENABLED = os.environ.get("AuthorCacheEnabled", "TRUE").lower() != "false"
+AUTHOR_CACHE_MAX_ENTRIES = int(os.environ.get("AUTHOR_CACHE_MAX_ENTRIES", "20000") or 20000)
+DEFAULT_VERIFY_INTEGRITY = os.environ.get("VerifyTemplateIntegrity", "false").lower() == "true"
+DEFAULT_TRANSACTIONAL_INSTALL = os.environ.get("TransactionalInstall", "false").lower() == "true"
+DEFAULT_INCREMENTAL_INSTALL = os.environ.get("IncrementalInstall", "false").lower() == "true"
+DEFAULT_RESUMABLE_INSTALL = os.environ.get("ResumableInstall", "false").lower() == "true"
+DEFAULT_PIPELINE_QUEUE_SIZE = int(os.environ.get("INSTALL_PIPELINE_QUEUE_SIZE", "8") or 8)
+COPY_BACKENDS = ("auto", "reflink", "copy_file_range", "sendfile", "buffered")
+DEFAULT_COPY_BACKEND = os.environ.get("INSTALL_COPY_BACKEND", "auto").strip().lower() or "auto"
+DEFAULT_DEDUPE_INSTALL = os.environ.get("DedupeTemplateInstall", "false").lower() == "true"
+BACKUP_LAYOUTS = ("store", "timestamped", "archive")
+DEFAULT_BACKUP_LAYOUT = os.environ.get("BACKUP_LAYOUT", "store").strip().lower() or "store"
+BACKUP_STRATEGIES = ("rename", "copy")
+DEFAULT_BACKUP_STRATEGY = os.environ.get("BACKUP_STRATEGY", "rename").strip().lower() or "rename"
+DEFAULT_BACKUP_MAX_VERSIONS = int(os.environ.get("BACKUP_MAX_VERSIONS", "0") or 0)
+DEFAULT_BACKUP_MAX_AGE_DAYS = float(os.environ.get("BACKUP_MAX_AGE_DAYS", "0") or 0)
+DEFAULT_BACKUP_MAX_BYTES = int(os.environ.get("BACKUP_MAX_BYTES", "0") or 0)
+DEFAULT_COPY_WORKERS = int(os.environ.get("INSTALL_COPY_WORKERS", "0") or 0)
+SINGLE_READ_MAX_BYTES = int(os.environ.get("SINGLE_READ_MAX_BYTES", str(64 * 1024 * 1024)) or 0)
 MRU_VALUE_PREFIX = "[F00000000][T01ED6D7E58D00000][O00000000]*"
 
 
@@ -231,6 +282,13 @@ DEFAULT_EXCEL_STARTUP_FOLDER = normalize_path(
     os.environ.get("EXCEL_STARTUP_FOLDER_PATH", _BASE_PATHS["EXCEL_STARTUP"])
 )
 DEFAULT_THEME_FOLDER = normalize_path(_BASE_PATHS["THEME"])
+DEFAULT_STATE_FOLDER = normalize_path(
+    os.environ.get("TEMPLATE_INSTALLER_STATE_PATH", _BASE_PATHS["LOCALAPPDATA"] / "TemplateInstaller")
+)
+DEFAULT_AUTHOR_CACHE_PATH = DEFAULT_STATE_FOLDER / "author_cache.json"
+DEFAULT_INSTALL_JOURNAL_PATH = DEFAULT_STATE_FOLDER / "install_journal.json"
+DEFAULT_INSTALL_CHECKPOINT_PATH = DEFAULT_STATE_FOLDER / "install_checkpoint.jsonl"
+DEFAULT_BACKUP_CATALOG_FOLDER = DEFAULT_STATE_FOLDER / "backup_catalog"
 
 SUPPORTED_TEMPLATE_EXTENSIONS = {
     ".dotx",
@@ -261,8 +319,26 @@ BASE_TEMPLATE_NAMES = {
 # --------------------------------------------------------------------------- #
 
 
+# Carpetas ya creadas o comprobadas en esta ejecución (destinos, Backups...): evita un
+# mkdir por archivo, que en AppData redirigida por SMB es un viaje de red cada vez.
+_ENSURED_DIRECTORIES: Set[Path] = set()
+_ENSURED_DIRECTORIES_LOCK = threading.Lock()
+
+
+def reset_directory_registry() -> None:
+    """Olvida las carpetas aseguradas y los índices de Backups leídos; se llama al inicio de cada ejecución."""
+    with _ENSURED_DIRECTORIES_LOCK:
+        _ENSURED_DIRECTORIES.clear()
+        _BACKUP_STORES.clear()
+
+
 def ensure_directory(path: Path) -> Path:
+    if path in _ENSURED_DIRECTORIES:
+        return path
     path.mkdir(parents=True, exist_ok=True)
+    with _ENSURED_DIRECTORIES_LOCK:
+        _ENSURED_DIRECTORIES.add(path)
+        _ENSURED_DIRECTORIES.update(path.parents)
     return path
 
 
@@ -272,17 +348,45 @@ def iter_template_files(base_dir: Path) -> Iterator[Path]:
 
 
 def resolve_base_directory(base_dir: Path) -> Path:
-    """Busca la carpeta que contiene las plantillas dentro de la ruta actual."""
+    """Busca la carpeta (o el bundle templates.tplpack) que contiene las plantillas dentro de la ruta actual.
+
+    Si el bundle comparte carpeta con plantillas sueltas más recientes o que no están en su
+    índice, se avisa y se usan las sueltas; un bundle pasado directamente se respeta siempre.
+    """
     candidates = [base_dir, base_dir / "payload", base_dir / "templates", base_dir / "extracted"]
     parent = base_dir.parent
     if parent != base_dir:
         candidates.extend([parent, parent / "payload", parent / "templates", parent / "extracted"])
+    if is_payload_archive(base_dir):
+        return normalize_path(base_dir)
     for candidate in candidates:
+        bundle = candidate / PAYLOAD_BUNDLE_NAME
+        if bundle.is_file():
+            stale = _stale_bundle_reason(bundle, candidate)
+            if stale is None:
+                return normalize_path(bundle)
+            LOGGER.warning("[PAYLOAD] Se ignora %s: %s. Se instalan las plantillas sueltas de %s (use --payload para forzar el bundle).", bundle, stale, candidate)
+            return normalize_path(candidate)
         if any(candidate.glob("*.dot*")) or any(candidate.glob("*.pot*")) or any(candidate.glob("*.xlt*")):
             return normalize_path(candidate)
     return normalize_path(base_dir)
 
 
+def _stale_bundle_reason(bundle: Path, folder: Path) -> Optional[str]:
+    """Motivo por el que el bundle no refleja las plantillas sueltas de su carpeta; None si está al día."""
+    try:
+        members = read_payload_bundle(bundle)
+        bundle_mtime = bundle.stat().st_mtime_ns
+        for file in iter_template_files(folder):
+            if file.name not in members:
+                return f"{file.name} no está en el bundle"
+            if file.stat().st_mtime_ns > bundle_mtime:
+                return f"{file.name} es más reciente que el bundle"
+    except (OSError, ValueError) as exc:
+        return f"no se pudo leer ({exc})"
+    return None
+
+
 def path_in_appdata(path: Path) -> bool:
     try:
         return normalize_path(path).resolve().as_posix().startswith(
@@ -292,9 +396,218 @@ def path_in_appdata(path: Path) -> bool:
         return False
 
 
-def ensure_parents_and_copy(source: Path, destination: Path) -> None:
+def ensure_parents_and_copy(
+    source: Path,
+    destination: Path,
+    data: bytes | None = None,
+    backend: str = DEFAULT_COPY_BACKEND,
+    mtime_ns: int | None = None,
+) -> str:
+    """Copia como shutil.copy2 y devuelve el backend usado.
+
+    Si se recibe `data` (el origen ya leído) se escribe desde memoria; si no, el contenido
+    se copia con copy_file_data(`backend`). Con `mtime_ns` (origen sin archivo propio, p. ej.
+    un miembro de un bundle) se fija esa fecha en lugar de copiar los metadatos del origen.
+
+    Se escribe en un temporal junto al destino y se sustituye con os.replace: nunca se
+    reescribe el inodo existente, que puede ser un enlace duro compartido (--dedupe).
+    """
     ensure_directory(destination.parent)
-    shutil.copy2(source, destination)
+    temp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        if data is None:
+            used = copy_file_data(source, temp_path, backend)
+        else:
+            with open(temp_path, "wb") as handle:
+                handle.write(data)
+            used = "memory"
+        _copy_times(source, temp_path, mtime_ns)
+        os.replace(temp_path, destination)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    return used
+
+
+def _copy_times(source: Path, destination: Path, mtime_ns: int | None = None) -> None:
+    if mtime_ns is None:
+        shutil.copystat(source, destination)
+    else:
+        os.utime(destination, ns=(mtime_ns, mtime_ns))
+
+
+# Errores con los que un backend de copia «no está disponible aquí» y se prueba el siguiente.
+_COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.ENOTTY,
+    errno.EBADF,
+    errno.EPERM,
+}
+_FICLONE = 0x40049409  # _IOW(0x94, 9, int), linux/fs.h
+
+
+def copy_file_data(source: Path, destination: Path, backend: str = DEFAULT_COPY_BACKEND) -> str:
+    """Copia solo el contenido (sin metadatos) y devuelve el backend que lo hizo.
+
+    La cadena es reflink (FICLONE) -> copy_file_range -> sendfile -> buffered; `backend`
+    indica por dónde empezar ("auto" = desde el principio) y los no soportados por el
+    sistema o el sistema de archivos se saltan.
+    """
+    with open(source, "rb") as source_handle, open(destination, "wb") as destination_handle:
+        size = os.fstat(source_handle.fileno()).st_size
+        return copy_fd_data(source_handle.fileno(), destination_handle.fileno(), size, backend)
+
+
+def copy_fd_data(source_fd: int, destination_fd: int, size: int, backend: str = DEFAULT_COPY_BACKEND) -> str:
+    if backend not in COPY_BACKENDS:
+        raise ValueError(f"Backend de copia desconocido: {backend}")
+    chain = _COPY_BACKEND_CHAIN if backend == "auto" else _COPY_BACKEND_CHAIN[COPY_BACKENDS.index(backend) - 1 :]
+    for name, copier in chain:
+        if name != "buffered":
+            try:
+                if not copier(source_fd, destination_fd, size):
+                    continue
+            except OSError as exc:
+                if exc.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                # Puede haber copiado una parte: se empieza de cero con el siguiente backend.
+                os.ftruncate(destination_fd, 0)
+                os.lseek(destination_fd, 0, os.SEEK_SET)
+                os.lseek(source_fd, 0, os.SEEK_SET)
+                continue
+            return name
+        copier(source_fd, destination_fd, size)
+        return name
+    raise AssertionError("la cadena de copia termina en buffered")
+
+
+def _copy_reflink(source_fd: int, destination_fd: int, size: int) -> bool:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    fcntl.ioctl(destination_fd, _FICLONE, source_fd)
+    return True
+
+
+def _copy_file_range(source_fd: int, destination_fd: int, size: int) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(source_fd, destination_fd, size - copied)
+        if count == 0:
+            raise OSError(errno.EINVAL, "copia incompleta")
+        copied += count
+    return True
+
+
+def _copy_sendfile(source_fd: int, destination_fd: int, size: int) -> bool:
+    # sendfile a un archivo regular solo está garantizado en Linux.
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        return False
+    offset = 0
+    while offset < size:
+        count = os.sendfile(destination_fd, source_fd, offset, size - offset)
+        if count == 0:
+            raise OSError(errno.EINVAL, "copia incompleta")
+        offset += count
+    return True
+
+
+def _copy_buffered(source_fd: int, destination_fd: int, size: int, chunk_size: int = 1024 * 1024) -> bool:
+    while True:
+        chunk = os.read(source_fd, chunk_size)
+        if not chunk:
+            return True
+        view = memoryview(chunk)
+        while view:
+            written = os.write(destination_fd, view)
+            view = view[written:]
+
+
+_COPY_BACKEND_CHAIN: tuple[tuple[str, Callable[[int, int, int], bool]], ...] = (
+    ("reflink", _copy_reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _copy_sendfile),
+    ("buffered", _copy_buffered),
+)
+
+
+def destination_unchanged(
+    source: Path,
+    destination: Path,
+    data: bytes | None = None,
+    source_fingerprint: tuple[int, int] | None = None,
+) -> bool:
+    """True si el destino ya es idéntico al origen.
+
+    Mismo tamaño y mtime (copy2 conserva el mtime) basta; con mismo tamaño pero distinto
+    mtime se comparan los hashes y, si coinciden, se copia el mtime para que la próxima
+    ejecución no tenga que volver a leer. `source_fingerprint` sustituye al stat del origen
+    cuando este es un miembro de una payload empaquetada.
+    """
+    source_fp = source_fingerprint or _file_fingerprint(source)
+    destination_fp = _file_fingerprint(destination)
+    if source_fp is None or destination_fp is None or source_fp[0] != destination_fp[0]:
+        return False
+    if source_fp[1] == destination_fp[1]:
+        return True
+    source_hash = hashlib.sha256(data).hexdigest() if data is not None else _sha256_file(source)
+    if source_hash is None or source_hash != _sha256_file(destination):
+        return False
+    try:
+        # Un enlace duro de --dedupe comparte el mtime con las demás rutas: no se toca.
+        if destination.stat().st_nlink == 1:
+            _copy_times(source, destination, source_fp[1] if source_fingerprint else None)
+    except OSError:
+        pass
+    return True
+
+
+def read_template_bytes(source: Path, max_bytes: int = SINGLE_READ_MAX_BYTES) -> Optional[bytes]:
+    """Lee el origen completo para validarlo y copiarlo con una sola lectura; None si no conviene."""
+    try:
+        if source.stat().st_size > max_bytes:
+            return None
+        with open(source, "rb") as handle:
+            return handle.read()
+    except OSError:
+        return None
+
+
+def verify_package(package: bytes) -> Optional[str]:
+    """Descomprime y comprueba el CRC de cada miembro de un paquete OOXML ya leído.
+
+    Se trabaja sobre los bytes que luego se copian: nunca se vuelve a abrir el archivo.
+    Devuelve None si está íntegro o la descripción del primer fallo.
+    """
+    try:
+        with zipfile.ZipFile(io.BytesIO(package)) as zipped:
+            bad_member = zipped.testzip()
+    except Exception as exc:  # noqa: BLE001
+        return str(exc) or exc.__class__.__name__
+    return f"CRC incorrecto en {bad_member}" if bad_member else None
+
+
+def log_integrity_throughput(flags: InstallFlags, design_mode: bool) -> None:
+    verified = flags.stats.get("verified_bytes", 0)
+    seconds = flags.stats.get("verify_seconds", 0.0)
+    if not verified:
+        return
+    throughput = verified / seconds / (1024 * 1024) if seconds else float("inf")
+    _design_log(
+        DESIGN_LOG_INSTALLER,
+        design_mode,
+        logging.INFO,
+        "[VERIFY] %.1f MiB verificados en %.3f s (%.1f MiB/s), paquetes dañados=%s.",
+        verified / (1024 * 1024),
+        seconds,
+        throughput,
+        flags.totals.get("corrupt", 0),
+    )
 
 
 def _design_log(enabled: bool, design_mode: bool, level: int, message: str, *args: object) -> None:
@@ -313,18 +626,31 @@ class AuthorCheckResult:
     message: str
     authors: List[str]
     error: bool = False
+    elapsed_ms: float = 0.0
 
     def as_cli_output(self) -> str:
         return "TRUE" if self.allowed and not self.error else "FALSE"
 
+    def as_json_record(self, target: Path) -> dict[str, object]:
+        return {
+            "path": str(target),
+            "author": self.authors[0] if self.authors else None,
+            "verdict": self.as_cli_output(),
+            "error": self.message if self.error else None,
+            "message": self.message,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
 
 def check_template_author(
     target: Path,
-    allowed_authors: Iterable[str] | None = None,
+    allowed_authors: Iterable[str] | AuthorPolicy | None = None,
     validation_enabled: bool = True,
     design_mode: bool = False,
+    jobs: int = 1,
+    cache: AuthorCache | None = None,
 ) -> AuthorCheckResult:
-    allowed = _normalize_allowed_authors(allowed_authors or DEFAULT_ALLOWED_TEMPLATE_AUTHORS)
+    policy = compile_author_policy(allowed_authors)
     target = normalize_path(target)
 
     if not target.exists():
@@ -337,11 +663,17 @@ def check_template_author(
 
     if target.is_dir():
         authors_found: list[str] = []
-        for file in iter_template_files(target):
+        files = sorted(iter_template_files(target))
+        extracted = _map_bounded(
+            lambda file: _extract_author_cached(file, cache),
+            [f for f in files if f.suffix.lower() != ".thmx"],
+            jobs,
+        )
+        for file in files:
             if file.suffix.lower() == ".thmx":
                 _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.INFO, "Archivo: %s - Autor: [OMITIDO TEMA]", file.name)
                 continue
-            author, error = _extract_author(file)
+            author, error = next(extracted)
             if error:
                 _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, error)
             if author:
@@ -363,45 +695,1546 @@ def check_template_author(
     if target.suffix.lower() == ".thmx":
         return AuthorCheckResult(True, "[INFO] Validación de autor omitida para temas.", [])
 
-    author, error = _extract_author(target)
+    author, error = _extract_author_cached(target, cache)
+    return _author_verdict(target, author, error, policy, lambda: _extended_properties_cached(target, policy, cache))
+
+
+def check_template_bytes(
+    source: Path,
+    data: bytes,
+    allowed_authors: Iterable[str] | AuthorPolicy | None = None,
+    validation_enabled: bool = True,
+    cache: AuthorCache | None = None,
+) -> AuthorCheckResult:
+    """Como check_template_author para un archivo, pero sobre su contenido ya leído en memoria."""
+    policy = compile_author_policy(allowed_authors)
+    source = normalize_path(source)
+    if not validation_enabled:
+        return AuthorCheckResult(True, "[INFO] Validación de autores deshabilitada.", [])
+    if source.suffix.lower() == ".thmx":
+        return AuthorCheckResult(True, "[INFO] Validación de autor omitida para temas.", [])
+    try:
+        author, error = _extract_author_from_stream(io.BytesIO(data), source.name)
+    except Exception as exc:  # noqa: BLE001
+        author, error = None, f"[ERROR] {source.name}: {exc}"
+    if cache is not None:
+        cache.store(source, author, error)
+
+    def _properties() -> dict[str, Optional[str]]:
+        properties = _extract_extended_properties(io.BytesIO(data), _policy_property_keys(policy))
+        if cache is not None:
+            cache.store_properties(source, properties)
+        return properties
+
+    return _author_verdict(source, author, error, policy, _properties)
+
+
+def _author_verdict(
+    target: Path,
+    author: Optional[str],
+    error: Optional[str],
+    policy: AuthorPolicy,
+    properties_loader: Callable[[], dict[str, Optional[str]]] | None = None,
+) -> AuthorCheckResult:
     if error:
-        return AuthorCheckResult(False, error, [], error=True)
+        # Sin autor o sin core.xml ([WARN]) la plantilla se leyó bien: es un bloqueo, no un error.
+        return AuthorCheckResult(False, error, [], error=not error.startswith("[WARN]"))
     if not author:
         return AuthorCheckResult(False, f"[WARN] El archivo \"{target}\" no tiene autor asignado.", [])
 
-    is_allowed = any(author.lower() == a.lower() for a in allowed)
+    is_allowed = policy.allows(author)
+    if is_allowed and policy.needs_extended_properties and properties_loader is not None:
+        reason = policy.extended_properties_violation(properties_loader())
+        if reason:
+            return AuthorCheckResult(False, f"[BLOCKED] {reason} para \"{target}\".", [author])
     message = "[OK] Autor aprobado." if is_allowed else f"[BLOCKED] Autor no permitido para \"{target}\"."
     return AuthorCheckResult(is_allowed, message, [author])
 
 
-def _normalize_allowed_authors(authors: Iterable[str]) -> list[str]:
-    normalized: list[str] = []
-    for author in authors:
-        cleaned = author.strip()
-        if cleaned:
-            normalized.append(cleaned)
-    return normalized
+def iter_author_checks(
+    files: Iterable[Path],
+    allowed_authors: Iterable[str] | AuthorPolicy | None = None,
+    validation_enabled: bool = True,
+    design_mode: bool = False,
+    jobs: int = 1,
+    cache: AuthorCache | None = None,
+) -> Iterator[tuple[Path, AuthorCheckResult]]:
+    """Valida el autor de varios archivos con hasta `jobs` hilos, respetando el orden de entrada."""
+    policy = compile_author_policy(allowed_authors)
+    targets = [normalize_path(file) for file in files]
+
+    def _check(target: Path) -> AuthorCheckResult:
+        start = time.perf_counter()
+        result = check_template_author(
+            target,
+            allowed_authors=policy,
+            validation_enabled=validation_enabled,
+            design_mode=design_mode,
+            cache=cache,
+        )
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    yield from zip(targets, _map_bounded(_check, targets, jobs))
+
+
+def validate_templates(
+    files: Iterable[Path],
+    allowed_authors: Iterable[str] | AuthorPolicy | None = None,
+    validation_enabled: bool = True,
+    design_mode: bool = False,
+    jobs: int = 1,
+    cache: AuthorCache | None = None,
+) -> dict[Path, AuthorCheckResult]:
+    """Valida toda la payload de una vez; el resultado se pasa a la etapa de copia como `verdicts`."""
+    verdicts: dict[Path, AuthorCheckResult] = {}
+    for target, result in iter_author_checks(files, allowed_authors, validation_enabled, design_mode, jobs, cache):
+        verdicts[target] = result
+        _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.DEBUG, "[AUTHOR] %s -> %s", target.name, result.as_cli_output())
+    return verdicts
+
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def _map_bounded(func: Callable[[_T], _R], items: list[_T], jobs: int) -> Iterator[_R]:
+    """map() ordenado que usa un pool de hilos acotado cuando hay más de un trabajo.
+
+    Nunca hay más de 2 * jobs tareas en vuelo, así que los resultados grandes (p. ej. el
+    contenido leído de cada plantilla) no se acumulan si el consumidor va más lento.
+    """
+    workers = min(max(1, jobs), len(items))
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    # Hilos y no procesos: zlib libera el GIL al descomprimir y en Windows cada proceso
+    # hijo volvería a importar common (con sus lecturas de registro).
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="author-check") as executor:
+        in_flight: deque[Future[_R]] = deque()
+        try:
+            for item in items:
+                in_flight.append(executor.submit(func, item))
+                if len(in_flight) >= workers * 2:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            # Consumidor que abandona (close() o excepción): lo que no ha empezado no se ejecuta.
+            for future in in_flight:
+                future.cancel()
+
+
+# Separadores habituales en dc:creator con varios autores ("a; b", "a & b", "a and b").
+_AUTHOR_SEPARATORS = re.compile(r"\s*(?:;|,|&|\||\band\b|\by\b)\s*", re.IGNORECASE)
+_GLOB_CHARACTERS = frozenset("*?[")
+
+
+@dataclass(frozen=True)
+class AuthorPolicy:
+    """Lista de autores permitidos compilada una vez por ejecución.
+
+    Entradas simples se comparan sin distinguir mayúsculas (casefold) contra un frozenset;
+    las que contienen comodines (*, ?, [) se tratan como glob y las que empiezan por "re:"
+    como expresión regular. Todas las reglas con patrón se combinan en una sola regex.
+    """
+
+    exact: frozenset[str] = frozenset()
+    pattern: Optional[re.Pattern[str]] = None
+    split_multiple: bool = False
+    check_last_modified_by: bool = False
+    allowed_companies: Optional[frozenset[str]] = None
+
+    @classmethod
+    def compile(
+        cls,
+        authors: Iterable[str],
+        split_multiple: bool = SPLIT_MULTIPLE_AUTHORS,
+        check_last_modified_by: bool = False,
+        allowed_companies: Iterable[str] | None = None,
+    ) -> "AuthorPolicy":
+        exact: set[str] = set()
+        patterns: list[str] = []
+        for author in authors:
+            cleaned = author.strip()
+            if not cleaned:
+                continue
+            if cleaned[:3].lower() == "re:":
+                patterns.append(cleaned[3:])
+            elif _GLOB_CHARACTERS.intersection(cleaned):
+                patterns.append(fnmatch.translate(cleaned.casefold()))
+            else:
+                exact.add(cleaned.casefold())
+        pattern = re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE) if patterns else None
+        companies = None
+        if allowed_companies is not None:
+            companies = frozenset(c.strip().casefold() for c in allowed_companies if c.strip())
+        return cls(frozenset(exact), pattern, split_multiple, check_last_modified_by, companies)
+
+    @property
+    def needs_extended_properties(self) -> bool:
+        return self.check_last_modified_by or self.allowed_companies is not None
+
+    def digest(self, validation_enabled: bool = True) -> str:
+        """SHA-256 de las reglas; un plan guardado solo se ejecuta con la misma política."""
+        rules = {
+            "exact": sorted(self.exact),
+            "pattern": self.pattern.pattern if self.pattern is not None else None,
+            "split_multiple": self.split_multiple,
+            "check_last_modified_by": self.check_last_modified_by,
+            "allowed_companies": sorted(self.allowed_companies) if self.allowed_companies is not None else None,
+            "validation_enabled": validation_enabled,
+        }
+        return hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def matches(self, name: str) -> bool:
+        key = name.strip().casefold()
+        if key in self.exact:
+            return True
+        return self.pattern is not None and self.pattern.fullmatch(key) is not None
+
+    def allows(self, creator: str) -> bool:
+        """El creador completo debe coincidir o, con `split_multiple`, cada uno de sus autores."""
+        if self.matches(creator):
+            return True
+        if not self.split_multiple:
+            return False
+        names = [name for name in _AUTHOR_SEPARATORS.split(creator) if name and name.strip()]
+        return len(names) > 1 and all(self.matches(name) for name in names)
+
+    def extended_properties_violation(self, properties: dict[str, Optional[str]]) -> Optional[str]:
+        last_modified_by = properties.get("last_modified_by")
+        if self.check_last_modified_by and last_modified_by and not self.allows(last_modified_by):
+            return f"Último editor no permitido ({last_modified_by})"
+        if self.allowed_companies is not None:
+            company = (properties.get("company") or "").strip()
+            if company.casefold() not in self.allowed_companies:
+                return f"Empresa no permitida ({company or 'vacía'})"
+        return None
+
+
+def compile_author_policy(allowed_authors: Iterable[str] | AuthorPolicy | None) -> AuthorPolicy:
+    if isinstance(allowed_authors, AuthorPolicy):
+        return allowed_authors
+    return AuthorPolicy.compile(list(allowed_authors or []) or DEFAULT_ALLOWED_TEMPLATE_AUTHORS)
 
 
 def _extract_author(template_path: Path) -> tuple[Optional[str], Optional[str]]:
+    try:
+        return _read_author(template_path)
+    except OSError as exc:
+        return None, f"[ERROR] {template_path.name}: {exc}"
+
+
+def _read_author(template_path: Path) -> tuple[Optional[str], Optional[str]]:
+    """Como _extract_author, pero los errores de E/S (archivo bloqueado por Word, permisos...)
+    se lanzan como OSError: son pasajeros y no deben acabar en la caché de autores."""
     if not template_path.exists():
         return None, f"[ERROR] No se encontró la ruta: \"{template_path}\""
 
+    with open(template_path, "rb") as handle:
+        try:
+            return _extract_author_from_stream(handle, template_path.name)
+        except OSError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            return None, f"[ERROR] {template_path.name}: {exc}"
+
+
+def _extract_author_from_stream(handle: BinaryIO, display_name: str) -> tuple[Optional[str], Optional[str]]:
+    """Lee solo docProps/core.xml: localiza el miembro desde el directorio central y deja de parsear al encontrar dc:creator."""
     try:
-        with zipfile.ZipFile(template_path) as zipped:
+        member = _locate_zip_member(handle, _CORE_XML_MEMBER)
+    except NotImplementedError:
+        # ZIP64, cifrado o compresión no estándar: se delega en zipfile.
+        handle.seek(0)
+        return _extract_author_zipfile(handle, display_name)
+    if member is None:
+        return None, f"[WARN] No se pudo obtener el autor para \"{display_name}\" (core.xml ausente)."
+
+    creator = _stream_core_property(_iter_zip_member_data(handle, member), _DC_CREATOR_TAGS)
+    if creator:
+        return creator, None
+    return None, f"[WARN] \"{display_name}\" sin autor definido."
+
+
+def _extract_author_zipfile(template: Path | BinaryIO, display_name: str | None = None) -> tuple[Optional[str], Optional[str]]:
+    """Implementación original basada en zipfile; se usa como respaldo y en benchmark.py."""
+    name = display_name or getattr(template, "name", str(template))
+    try:
+        with zipfile.ZipFile(template) as zipped:
             try:
                 with zipped.open("docProps/core.xml") as core_file:
                     tree = ET.fromstring(core_file.read())
             except KeyError:
-                return None, f"[WARN] No se pudo obtener el autor para \"{template_path.name}\" (core.xml ausente)."
+                return None, f"[WARN] No se pudo obtener el autor para \"{name}\" (core.xml ausente)."
+    except OSError as exc:
+        if not isinstance(template, (str, Path)):
+            raise  # leyendo de un archivo abierto por _read_author: error de E/S, no de formato
+        return None, f"[ERROR] {name}: {exc}"
     except Exception as exc:  # noqa: BLE001
-        return None, f"[ERROR] {template_path.name}: {exc}"
+        return None, f"[ERROR] {name}: {exc}"
 
-    for candidate in ("{http://purl.org/dc/elements/1.1/}creator", "creator"):
+    for candidate in _DC_CREATOR_TAGS:
         node = tree.find(candidate)
         if node is not None and node.text:
             return node.text.strip(), None
-    return None, f"[WARN] \"{template_path.name}\" sin autor definido."
+    return None, f"[WARN] \"{name}\" sin autor definido."
+
+
+# --------------------------------------------------------------------------- #
+# Lector mínimo de paquetes OOXML
+# --------------------------------------------------------------------------- #
+
+_CORE_XML_MEMBER = "docProps/core.xml"
+_DC_CREATOR_TAGS = ("{http://purl.org/dc/elements/1.1/}creator", "creator")
+_CP_LAST_MODIFIED_BY_TAGS = (
+    "{http://schemas.openxmlformats.org/package/2006/metadata/core-properties}lastModifiedBy",
+    "lastModifiedBy",
+)
+_APP_XML_MEMBER = "docProps/app.xml"
+_APP_COMPANY_TAGS = ("{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}Company", "Company")
+_ZIP_EOCD = struct.Struct("<4s4H2LH")
+_ZIP_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_ZIP_EOCD_SIGNATURE = b"PK\x05\x06"
+_ZIP_CENTRAL_SIGNATURE = b"PK\x01\x02"
+_ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+_ZIP_MAX_COMMENT = 0xFFFF
+_ZIP_READ_CHUNK = 64 * 1024
+
+
+@dataclass
+class _ZipMember:
+    name: str
+    method: int
+    compressed_size: int
+    uncompressed_size: int
+    crc: int
+    data_offset: int
+
+
+def _locate_zip_member(handle: BinaryIO, member_name: str) -> Optional[_ZipMember]:
+    """Busca un miembro leyendo el registro de fin de directorio central y solo las cabeceras necesarias.
+
+    Lanza zipfile.BadZipFile si el archivo no es un ZIP y NotImplementedError para
+    variantes que este lector no cubre (ZIP64, multi-disco, cifrado, métodos raros).
+    """
+    handle.seek(0, os.SEEK_END)
+    file_size = handle.tell()
+    tail_size = min(file_size, _ZIP_EOCD.size + _ZIP_MAX_COMMENT)
+    handle.seek(file_size - tail_size)
+    tail = handle.read(tail_size)
+    eocd_index = tail.rfind(_ZIP_EOCD_SIGNATURE)
+    if eocd_index < 0 or len(tail) - eocd_index < _ZIP_EOCD.size:
+        raise zipfile.BadZipFile("File is not a zip file")
+    _, disk, cd_disk, _, entries, cd_size, cd_offset, _ = _ZIP_EOCD.unpack_from(tail, eocd_index)
+    if disk or cd_disk or entries == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+        raise NotImplementedError("ZIP64/multi-disco")
+
+    eocd_position = file_size - tail_size + eocd_index
+    # Datos antepuestos al ZIP (p. ej. autoextraíbles) desplazan todos los offsets.
+    prefix = eocd_position - cd_size - cd_offset
+    if prefix < 0:
+        raise zipfile.BadZipFile("Bad magic number for central directory")
+    handle.seek(prefix + cd_offset)
+    central = handle.read(cd_size)
+
+    wanted = member_name.encode("utf-8")
+    search_from = 0
+    while True:
+        name_index = central.find(wanted, search_from)
+        if name_index < 0:
+            return None
+        search_from = name_index + 1
+        header_index = name_index - _ZIP_CENTRAL_HEADER.size
+        if header_index < 0 or central[header_index : header_index + 4] != _ZIP_CENTRAL_SIGNATURE:
+            continue
+        fields = _ZIP_CENTRAL_HEADER.unpack_from(central, header_index)
+        flags, method, crc, compressed_size, uncompressed_size, name_length = (
+            fields[3], fields[4], fields[7], fields[8], fields[9], fields[10]
+        )
+        if name_length != len(wanted):
+            continue
+        local_offset = fields[16]
+        break
+
+    if flags & 0x1:
+        raise NotImplementedError("miembro cifrado")
+    if method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        raise NotImplementedError(f"método de compresión {method}")
+    if 0xFFFFFFFF in (compressed_size, uncompressed_size, local_offset):
+        raise NotImplementedError("ZIP64")
+
+    handle.seek(prefix + local_offset)
+    local = handle.read(_ZIP_LOCAL_HEADER.size)
+    if len(local) != _ZIP_LOCAL_HEADER.size or local[:4] != _ZIP_LOCAL_SIGNATURE:
+        raise zipfile.BadZipFile("Bad magic number for file header")
+    local_fields = _ZIP_LOCAL_HEADER.unpack(local)
+    data_offset = prefix + local_offset + _ZIP_LOCAL_HEADER.size + local_fields[9] + local_fields[10]
+    return _ZipMember(member_name, method, compressed_size, uncompressed_size, crc, data_offset)
+
+
+def _iter_zip_member_data(handle: BinaryIO, member: _ZipMember) -> Iterator[bytes]:
+    """Entrega el contenido descomprimido del miembro en bloques, a demanda."""
+    handle.seek(member.data_offset)
+    remaining = member.compressed_size
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS) if member.method == zipfile.ZIP_DEFLATED else None
+    while remaining > 0:
+        chunk = handle.read(min(_ZIP_READ_CHUNK, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {member.name}")
+        remaining -= len(chunk)
+        data = inflater.decompress(chunk) if inflater is not None else chunk
+        if data:
+            yield data
+    if inflater is not None:
+        tail = inflater.flush()
+        if tail:
+            yield tail
+
+
+def _stream_core_property(chunks: Iterable[bytes], tags: Iterable[str]) -> Optional[str]:
+    """Parsea core.xml de forma incremental y devuelve el primer hijo directo no vacío de `tags`."""
+    wanted = tuple(tags)
+    found: dict[str, str] = {}
+    parser = ET.XMLPullParser(events=("start", "end"))
+    depth = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and element.tag in wanted and element.text and element.text.strip():
+                found.setdefault(element.tag, element.text.strip())
+                if element.tag == wanted[0]:
+                    return found[element.tag]
+    parser.close()
+    for tag in wanted:
+        if tag in found:
+            return found[tag]
+    return None
+
+
+def _read_package_property(handle: BinaryIO, member_name: str, tags: Iterable[str]) -> Optional[str]:
+    try:
+        member = _locate_zip_member(handle, member_name)
+    except NotImplementedError:
+        handle.seek(0)
+        with zipfile.ZipFile(handle) as zipped:
+            try:
+                chunks: Iterable[bytes] = [zipped.read(member_name)]
+            except KeyError:
+                return None
+        return _stream_core_property(chunks, tags)
+    if member is None:
+        return None
+    return _stream_core_property(_iter_zip_member_data(handle, member), tags)
+
+
+def _extract_extended_properties(handle: BinaryIO, keys: Iterable[str]) -> dict[str, Optional[str]]:
+    """Lee solo las propiedades adicionales pedidas ("last_modified_by", "company")."""
+    properties: dict[str, Optional[str]] = {}
+    try:
+        for key in keys:
+            if key == "last_modified_by":
+                properties[key] = _read_package_property(handle, _CORE_XML_MEMBER, _CP_LAST_MODIFIED_BY_TAGS)
+            elif key == "company":
+                properties[key] = _read_package_property(handle, _APP_XML_MEMBER, _APP_COMPANY_TAGS)
+    except Exception:  # noqa: BLE001 - el autor ya se validó; sin propiedades se aplica la regla estricta
+        pass
+    return properties
+
+
+def _extended_properties_cached(template_path: Path, policy: AuthorPolicy, cache: AuthorCache | None) -> dict[str, Optional[str]]:
+    keys = _policy_property_keys(policy)
+    cached = cache.lookup_properties(template_path) if cache is not None else None
+    if cached is not None and all(key in cached for key in keys):
+        return cached
+    try:
+        with open(template_path, "rb") as handle:
+            properties = _extract_extended_properties(handle, keys)
+    except OSError:
+        return {}
+    if cache is not None:
+        cache.store_properties(template_path, properties)
+    return properties
+
+
+def _policy_property_keys(policy: AuthorPolicy) -> list[str]:
+    keys = []
+    if policy.check_last_modified_by:
+        keys.append("last_modified_by")
+    if policy.allowed_companies is not None:
+        keys.append("company")
+    return keys
+
+
+# --------------------------------------------------------------------------- #
+# Caché persistente de autores
+# --------------------------------------------------------------------------- #
+
+
+class AuthorCache:
+    """Autores ya extraídos, indexados por ruta + tamaño + mtime (y opcionalmente SHA-256).
+
+    Se guarda el creador (o el error de extracción) y no el veredicto, que se recalcula
+    contra la lista de autores vigente; así cambiar la lista no exige invalidar nada.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path, max_entries: int = AUTHOR_CACHE_MAX_ENTRIES, verify_hash: bool = False) -> None:
+        self.path = normalize_path(path)
+        self.max_entries = max(1, max_entries)
+        self.verify_hash = verify_hash
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(
+        cls,
+        path: Path | None = None,
+        max_entries: int = AUTHOR_CACHE_MAX_ENTRIES,
+        verify_hash: bool = False,
+    ) -> "AuthorCache":
+        cache = cls(path or DEFAULT_AUTHOR_CACHE_PATH, max_entries, verify_hash)
+        try:
+            data = json.loads(cache.path.read_text(encoding="utf-8"))
+            if data.get("version") == cls.VERSION and isinstance(data.get("entries"), dict):
+                cache._entries = data["entries"]
+        except (OSError, ValueError, AttributeError):
+            pass
+        return cache
+
+    def lookup(self, file: Path) -> Optional[tuple[Optional[str], Optional[str]]]:
+        """Devuelve (autor, error) si la huella del archivo coincide; None si hay que extraerlo."""
+        with self._lock:
+            entry = self._entries.get(_cache_key(file))
+        fingerprint = _file_fingerprint(file)
+        valid = entry is not None and fingerprint is not None
+        valid = valid and [entry.get("size"), entry.get("mtime_ns")] == list(fingerprint)
+        valid = valid and (not self.verify_hash or entry.get("sha256") == _sha256_file(file))
+        with self._lock:
+            if not valid:
+                self.misses += 1
+                return None
+            entry["used"] = time.time()
+            self._dirty = True
+            self.hits += 1
+        return entry.get("author"), entry.get("error")
+
+    def store(self, file: Path, author: Optional[str], error: Optional[str]) -> None:
+        fingerprint = _file_fingerprint(file)
+        if fingerprint is None:
+            return
+        entry = {
+            "size": fingerprint[0],
+            "mtime_ns": fingerprint[1],
+            "author": author,
+            "error": error,
+            "used": time.time(),
+        }
+        if self.verify_hash:
+            entry["sha256"] = _sha256_file(file)
+        with self._lock:
+            self._entries[_cache_key(file)] = entry
+            self._dirty = True
+
+    def lookup_properties(self, file: Path) -> Optional[dict[str, Optional[str]]]:
+        """Propiedades extendidas guardadas para la misma huella (ver AuthorPolicy)."""
+        fingerprint = _file_fingerprint(file)
+        with self._lock:
+            entry = self._entries.get(_cache_key(file))
+            if entry is None or fingerprint is None or [entry.get("size"), entry.get("mtime_ns")] != list(fingerprint):
+                return None
+            return entry.get("properties")
+
+    def store_properties(self, file: Path, properties: dict[str, Optional[str]]) -> None:
+        fingerprint = _file_fingerprint(file)
+        with self._lock:
+            entry = self._entries.get(_cache_key(file))
+            if entry is None or fingerprint is None or [entry.get("size"), entry.get("mtime_ns")] != list(fingerprint):
+                return
+            entry["properties"] = {**entry.get("properties", {}), **properties}
+            self._dirty = True
+
+    def invalidate(self, file: Path | None = None) -> None:
+        """Olvida un archivo concreto o, sin argumento, toda la caché."""
+        with self._lock:
+            if file is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_cache_key(file), None)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Escribe la caché (si cambió) descartando las entradas menos usadas por encima del límite."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self._entries) > self.max_entries:
+                ordered = sorted(self._entries.items(), key=lambda item: item[1].get("used", 0), reverse=True)
+                self._entries = dict(ordered[: self.max_entries])
+            payload = json.dumps({"version": self.VERSION, "entries": self._entries}, ensure_ascii=False)
+            self._dirty = False
+        ensure_directory(self.path.parent)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(payload, encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+
+def load_author_cache(
+    enabled: bool = AUTHOR_CACHE_ENABLED,
+    path: Path | None = None,
+    verify_hash: bool = False,
+) -> Optional[AuthorCache]:
+    if not enabled:
+        return None
+    return AuthorCache.load(path, verify_hash=verify_hash)
+
+
+def save_author_cache(cache: AuthorCache | None, design_mode: bool) -> None:
+    if cache is None:
+        return
+    try:
+        cache.save()
+        _design_log(
+            DESIGN_LOG_AUTHOR,
+            design_mode,
+            logging.INFO,
+            "[CACHE] Autores en caché: aciertos=%s, fallos=%s (%s)",
+            cache.hits,
+            cache.misses,
+            cache.path,
+        )
+    except OSError as exc:
+        _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, "[WARN] No se pudo guardar la caché de autores (%s)", exc)
+
+
+def _extract_author_cached(template_path: Path, cache: AuthorCache | None) -> tuple[Optional[str], Optional[str]]:
+    if cache is None:
+        return _extract_author(template_path)
+    cached = cache.lookup(template_path)
+    if cached is not None:
+        return cached
+    try:
+        author, error = _read_author(template_path)
+    except OSError as exc:
+        return None, f"[ERROR] {template_path.name}: {exc}"  # pasajero: no se guarda
+    cache.store(template_path, author, error)
+    return author, error
+
+
+def _cache_key(file: Path) -> str:
+    try:
+        resolved = normalize_path(file).resolve()
+    except OSError:
+        resolved = normalize_path(file)
+    return os.path.normcase(str(resolved))
+
+
+def _file_fingerprint(file: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = file.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _sha256_file(file: Path, chunk_size: int = 1024 * 1024) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(file, "rb") as handle:
+            for chunk in iter(lambda: handle.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+# --------------------------------------------------------------------------- #
+# Manifiesto de payload
+# --------------------------------------------------------------------------- #
+
+PAYLOAD_MANIFEST_NAME = "templates.manifest.json"
+MANIFEST_VERIFY_MODES = ("stat", "hash")
+
+
+@dataclass
+class PayloadManifest:
+    """Huella confiable de cada archivo de la payload, generada con build_manifest.py.
+
+    Si un archivo coincide con su entrada (tamaño + mtime, o SHA-256), el autor registrado
+    sustituye a la apertura del ZIP. El manifiesto debe distribuirse por el mismo canal que
+    la payload: quien pueda modificarlo puede aprobar cualquier plantilla.
+    """
+
+    path: Path
+    entries: dict[str, dict] = field(default_factory=dict)
+    generated: str = ""
+
+    VERSION = 1
+
+    @classmethod
+    def build(cls, base_dir: Path, jobs: int = 1) -> "PayloadManifest":
+        base_dir = normalize_path(base_dir)
+        files = sorted(iter_template_files(base_dir))
+        manifest = cls(base_dir / PAYLOAD_MANIFEST_NAME, generated=datetime.now().isoformat(timespec="seconds"))
+        for file, entry in zip(files, _map_bounded(_manifest_entry, files, jobs)):
+            manifest.entries[file.name] = entry
+        return manifest
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PayloadManifest"]:
+        path = normalize_path(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return None
+        entries = {entry["name"]: entry for entry in data.get("files", []) if isinstance(entry, dict) and "name" in entry}
+        return cls(path, entries, str(data.get("generated", "")))
+
+    def save(self) -> None:
+        files = [self.entries[name] for name in sorted(self.entries)]
+        payload = {"version": self.VERSION, "generated": self.generated, "files": files}
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        temp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.path)
+
+    def verify(self, file: Path, mode: str = "stat") -> Optional[dict]:
+        """Devuelve la entrada si el archivo coincide con el manifiesto; None si hay que validarlo."""
+        entry = self.entries.get(file.name)
+        fingerprint = _file_fingerprint(file)
+        if entry is None or fingerprint is None or entry.get("size") != fingerprint[0]:
+            return None
+        if mode == "stat" and entry.get("mtime_ns") == fingerprint[1]:
+            return entry
+        # Mismo tamaño pero mtime distinto (copia, extracción) o modo hash: se decide por contenido.
+        return entry if entry.get("sha256") == _sha256_file(file) else None
+
+
+def load_payload_manifest(base_dir: Path, path: Path | None = None) -> Optional[PayloadManifest]:
+    return PayloadManifest.load(path or normalize_path(base_dir) / PAYLOAD_MANIFEST_NAME)
+
+
+def validate_with_manifest(
+    manifest: PayloadManifest,
+    files: Iterable[Path],
+    allowed_authors: Iterable[str] | AuthorPolicy | None = None,
+    validation_enabled: bool = True,
+    design_mode: bool = False,
+    mode: str = "stat",
+) -> dict[Path, AuthorCheckResult]:
+    """Veredictos para los archivos que coinciden con el manifiesto; los demás quedan fuera del dict."""
+    policy = compile_author_policy(allowed_authors)
+    verdicts: dict[Path, AuthorCheckResult] = {}
+    for file in files:
+        file = normalize_path(file)
+        if not validation_enabled or file.suffix.lower() == ".thmx":
+            continue
+        entry = manifest.verify(file, mode)
+        if entry is None:
+            _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, "[MANIFEST] %s no coincide con el manifiesto; se valida el ZIP.", file.name)
+            continue
+        properties = entry.get("properties") or {}
+        verdicts[file] = _author_verdict(file, entry.get("author"), entry.get("error"), policy, lambda: properties)
+        _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.DEBUG, "[MANIFEST] %s -> %s", file.name, verdicts[file].as_cli_output())
+    return verdicts
+
+
+def _manifest_entry(file: Path) -> dict:
+    author, error = _extract_author(file)
+    fingerprint = _file_fingerprint(file) or (0, 0)
+    role = payload_destination_role(file.name)
+    properties: dict[str, Optional[str]] = {}
+    try:
+        with open(file, "rb") as handle:
+            properties = _extract_extended_properties(handle, ("last_modified_by", "company"))
+    except OSError:
+        pass
+    return {
+        "name": file.name,
+        "size": fingerprint[0],
+        "mtime_ns": fingerprint[1],
+        "sha256": _sha256_file(file),
+        "app": role[0] if role else None,
+        "role": role[1] if role else None,
+        "author": author,
+        "error": error,
+        "properties": properties,
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Payload empaquetada
+# --------------------------------------------------------------------------- #
+
+PAYLOAD_BUNDLE_NAME = "templates.tplpack"
+PAYLOAD_BUNDLE_SUFFIX = ".tplpack"
+_BUNDLE_MAGIC = b"TPLPACK1"
+_BUNDLE_HEADER = struct.Struct("<8sI")  # magia + longitud del índice JSON
+
+
+@dataclass
+class PayloadMember:
+    """Una plantilla de una payload empaquetada; su contenido se lee con read() al necesitarlo.
+
+    Los readers solo recorren el índice del bundle o el directorio central del ZIP, así
+    que la memoria depende de los trabajos en curso y no del tamaño de la payload.
+
+    Si `indexed`, autor, error y propiedades vienen del índice generado con pack_payload.py
+    y solo valen mientras el contenido coincida con `sha256`.
+    """
+
+    name: str
+    size: int
+    mtime_ns: int
+    loader: Callable[[], bytes] = field(repr=False, compare=False)
+    sha256: Optional[str] = None
+    indexed: bool = False
+    author: Optional[str] = None
+    author_error: Optional[str] = None
+    properties: dict[str, Optional[str]] = field(default_factory=dict)
+
+    @property
+    def fingerprint(self) -> tuple[int, int]:
+        return self.size, self.mtime_ns
+
+    def read(self) -> bytes:
+        """Contenido del miembro; ValueError si ya no coincide con el tamaño del índice."""
+        data = self.loader()
+        if len(data) != self.size:
+            raise ValueError(f"{self.name}: la payload cambió desde que se leyó su índice")
+        return data
+
+
+def pack_payload(base_dir: Path, output: Path | None = None, jobs: int = 1) -> tuple[Path, int]:
+    """Empaqueta las plantillas de `base_dir` en un único archivo con índice; devuelve (ruta, nº de archivos).
+
+    Formato: magia "TPLPACK1", longitud del índice (uint32 LE), índice JSON UTF-8 con
+    nombre, offset, tamaño, SHA-256, autor y rol de destino de cada archivo, y después
+    los contenidos concatenados en el orden del índice.
+    """
+    base_dir = normalize_path(base_dir)
+    output = normalize_path(output) if output else base_dir / PAYLOAD_BUNDLE_NAME
+    files = sorted(iter_template_files(base_dir))
+    entries = list(_map_bounded(_manifest_entry, files, jobs))
+    offset = 0
+    for entry in entries:
+        entry["offset"] = offset
+        offset += entry["size"]
+    index = json.dumps(
+        {"version": 1, "generated": datetime.now().isoformat(timespec="seconds"), "files": entries},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    ensure_directory(output.parent)
+    temp_path = output.with_name(output.name + ".tmp")
+    with open(temp_path, "wb") as handle:
+        handle.write(_BUNDLE_HEADER.pack(_BUNDLE_MAGIC, len(index)))
+        handle.write(index)
+        for file, entry in zip(files, entries):
+            start = handle.tell()
+            with open(file, "rb") as source:
+                shutil.copyfileobj(source, handle, 1024 * 1024)
+            if handle.tell() - start != entry["size"]:
+                raise OSError(f"{file.name} cambió mientras se empaquetaba")
+    os.replace(temp_path, output)
+    return output, len(entries)
+
+
+def read_payload_bundle(path: Path) -> dict[str, PayloadMember]:
+    """Lee el índice del bundle; cada contenido se lee después, de uno en uno, con read()."""
+    with open(path, "rb") as handle:
+        header = handle.read(_BUNDLE_HEADER.size)
+        if len(header) != _BUNDLE_HEADER.size:
+            raise ValueError("bundle truncado")
+        magic, index_size = _BUNDLE_HEADER.unpack(header)
+        if magic != _BUNDLE_MAGIC:
+            raise ValueError("no es un bundle de plantillas")
+        index = json.loads(handle.read(index_size).decode("utf-8"))
+        data_start = handle.tell()
+        bundle_size = os.fstat(handle.fileno()).st_size
+    members: dict[str, PayloadMember] = {}
+    position = 0
+    for entry in sorted(index.get("files", []), key=lambda item: item["offset"]):
+        if entry["offset"] != position:
+            raise ValueError(f"índice inconsistente en {entry.get('name')}")
+        position += entry["size"]
+        if data_start + position > bundle_size:
+            raise ValueError(f"bundle truncado en {entry['name']}")
+        members[entry["name"]] = PayloadMember(
+            entry["name"],
+            entry["size"],
+            int(entry.get("mtime_ns") or 0),
+            _bundle_member_loader(path, data_start + entry["offset"], entry["size"]),
+            sha256=entry.get("sha256"),
+            indexed=True,
+            author=entry.get("author"),
+            author_error=entry.get("error"),
+            properties=entry.get("properties") or {},
+        )
+    return members
+
+
+def _bundle_member_loader(path: Path, offset: int, size: int) -> Callable[[], bytes]:
+    def load() -> bytes:
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            return handle.read(size)
+
+    return load
+
+
+class _SharedZipReader:
+    """Un único ZipFile abierto por payload; reabrirlo por miembro releería el directorio central cada vez."""
+
+    def __init__(self, path: Path) -> None:
+        self.archive = zipfile.ZipFile(path)
+        self._lock = threading.Lock()
+
+    def read(self, info: zipfile.ZipInfo) -> bytes:
+        with self._lock:
+            return self.archive.read(info)
+
+
+def _zip_member_loader(reader: _SharedZipReader, info: zipfile.ZipInfo) -> Callable[[], bytes]:
+    def load() -> bytes:
+        return reader.read(info)
+
+    return load
+
+
+def read_payload_zip(path: Path) -> dict[str, PayloadMember]:
+    """Plantillas de un .zip de distribución; read() descomprime cada una en memoria (sin extraer a disco).
+
+    Todos los miembros comparten un ZipFile abierto (ver _SharedZipReader), así que leer n
+    plantillas no vuelve a recorrer el directorio central n veces.
+
+    Se ignoran las carpetas internas del ZIP: cuenta el nombre de archivo (el primero gana
+    si se repite). Si el ZIP incluye templates.manifest.json, sus entradas hacen de índice
+    igual que en un bundle.
+    """
+    members: dict[str, PayloadMember] = {}
+    reader = _SharedZipReader(path)
+    archive = reader.archive
+    manifest_entries: dict[str, dict] = {}
+    for info in archive.infolist():
+        name = info.filename.replace("\\", "/").rsplit("/", 1)[-1]
+        if info.is_dir() or info.filename.startswith("__MACOSX/"):
+            continue
+        if name == PAYLOAD_MANIFEST_NAME and not manifest_entries:
+            try:
+                manifest = json.loads(archive.read(info).decode("utf-8"))
+                manifest_entries = {entry["name"]: entry for entry in manifest.get("files", []) if "name" in entry}
+            except (ValueError, KeyError, AttributeError):
+                manifest_entries = {}
+            continue
+        if Path(name).suffix.lower() not in SUPPORTED_TEMPLATE_EXTENSIONS or name in members:
+            continue
+        members[name] = PayloadMember(name, info.file_size, _zip_mtime_ns(info), _zip_member_loader(reader, info))
+    for name, member in members.items():
+        entry = manifest_entries.get(name)
+        if entry is not None and entry.get("sha256"):
+            member.sha256 = entry["sha256"]
+            member.indexed = True
+            member.author = entry.get("author")
+            member.author_error = entry.get("error")
+            member.properties = entry.get("properties") or {}
+    return members
+
+
+def _zip_mtime_ns(info: zipfile.ZipInfo) -> int:
+    return int(time.mktime(info.date_time + (0, 0, -1)) * 1_000_000_000)
+
+
+PAYLOAD_ARCHIVE_READERS: dict[str, Callable[[Path], dict[str, PayloadMember]]] = {
+    PAYLOAD_BUNDLE_SUFFIX: read_payload_bundle,
+    ".zip": read_payload_zip,
+}
+
+
+def is_payload_archive(path: Path) -> bool:
+    return path.suffix.lower() in PAYLOAD_ARCHIVE_READERS and path.is_file()
+
+
+def load_payload_members(base_dir: Path) -> Optional[dict[str, PayloadMember]]:
+    """Miembros de una payload empaquetada (bundle o .zip); None si `base_dir` es una carpeta normal."""
+    if not is_payload_archive(base_dir):
+        return None
+    try:
+        return PAYLOAD_ARCHIVE_READERS[base_dir.suffix.lower()](base_dir)
+    except zipfile.BadZipFile as exc:
+        raise ValueError(f"ZIP no válido: {exc}") from exc
+
+
+def check_payload_member(
+    source: Path,
+    member: PayloadMember,
+    data: bytes,
+    allowed_authors: Iterable[str] | AuthorPolicy | None = None,
+    validation_enabled: bool = True,
+) -> AuthorCheckResult:
+    """Veredicto de un miembro (`data` = member.read()): desde el índice si el contenido coincide; si no, desde los bytes."""
+    policy = compile_author_policy(allowed_authors)
+    if not member.indexed or not validation_enabled or source.suffix.lower() == ".thmx":
+        return check_template_bytes(source, data, policy, validation_enabled)
+    if member.sha256 != hashlib.sha256(data).hexdigest():
+        return AuthorCheckResult(False, f"[ERROR] {source.name}: el contenido no coincide con el índice del bundle.", [], error=True)
+    properties = member.properties
+    return _author_verdict(source, member.author, member.author_error, policy, lambda: properties)
+
+
+# --------------------------------------------------------------------------- #
+# Instalación transaccional
+# --------------------------------------------------------------------------- #
+
+
+class InstallTransaction:
+    """Copia cada archivo a un temporal junto a su destino y los reemplaza todos al final.
+
+    El diario (JSONL en la carpeta de estado) solo crece: una línea "stage" (con fsync)
+    antes de crear cada temporal, "drop" si no se pudo crear y "commit" (con fsync) antes
+    del primer os.replace; tras los reemplazos se hace fsync de las carpetas de destino.
+    Sin "commit" la siguiente ejecución borra los temporales (vuelta atrás); con él
+    completa los os.replace pendientes (avance). Mientras quede un diario sin recuperar
+    no se puede empezar otra transacción (begin lanza FileExistsError).
+    """
+
+    def __init__(self, journal_path: Path | None = None) -> None:
+        self.journal_path = journal_path or DEFAULT_INSTALL_JOURNAL_PATH
+        self.id = uuid.uuid4().hex[:12]
+        self.entries: list[dict[str, str]] = []
+        self._handle: Optional[io.TextIOWrapper] = None
+        self._owns_journal = False
+        self._lock = threading.Lock()
+
+    def begin(self) -> None:
+        """Crea el diario; FileExistsError si otra transacción dejó uno sin recuperar."""
+        with self._lock:
+            self._open()
+
+    def stage(
+        self,
+        source: Path,
+        destination: Path,
+        data: bytes | None = None,
+        backend: str = DEFAULT_COPY_BACKEND,
+        link_from: Path | None = None,
+        mtime_ns: int | None = None,
+    ) -> Path:
+        """Prepara el temporal de `destination`: copia de `source` o enlace duro a `link_from`."""
+        staged = destination.with_name(f".{destination.name}.{self.id}.tmp")
+        entry = {"staged": str(staged), "destination": str(destination)}
+        with self._lock:
+            self._append({"op": "stage", **entry}, sync=True)
+            self.entries.append(entry)
+        ensure_directory(destination.parent)
+        try:
+            if link_from is not None:
+                os.link(link_from, staged)
+                return staged
+            with open(staged, "wb") as handle:
+                if data is not None:
+                    handle.write(data)
+                else:
+                    with open(source, "rb") as source_handle:
+                        size = os.fstat(source_handle.fileno()).st_size
+                        copy_fd_data(source_handle.fileno(), handle.fileno(), size, backend)
+                handle.flush()
+                os.fsync(handle.fileno())
+            _copy_times(source, staged, mtime_ns)
+        except OSError:
+            _remove_quietly(staged)
+            with self._lock:
+                self.entries.remove(entry)
+                self._append({"op": "drop", "staged": entry["staged"]})
+            raise
+        return staged
+
+    def commit(self, design_mode: bool = False) -> list[Path]:
+        """Reemplaza los destinos; devuelve los que fallaron (quedan en el diario para la próxima ejecución).
+
+        Los ya reemplazados no tienen temporal, así que la recuperación los salta.
+        """
+        if not self.entries:
+            self._remove_journal()
+            return []
+        with self._lock:
+            self._append({"op": "commit"}, sync=True)
+            self._close()
+        failed = _replace_journal_entries(self.entries, design_mode)
+        if not failed:
+            self._remove_journal()
+        return failed
+
+    def rollback(self) -> None:
+        for entry in self.entries:
+            _remove_quietly(Path(entry["staged"]))
+        self.entries = []
+        self._remove_journal()
+
+    def _open(self) -> None:
+        if self._owns_journal:
+            return
+        ensure_directory(self.journal_path.parent)
+        try:
+            # "x": nunca se trunca el diario de una transacción que aún no se recuperó
+            self._handle = open(self.journal_path, "x", encoding="utf-8")
+        except FileExistsError as exc:
+            raise FileExistsError(
+                errno.EEXIST,
+                "queda una transacción de instalación sin recuperar; no se inicia otra",
+                str(self.journal_path),
+            ) from exc
+        self._owns_journal = True
+        self._handle.write(json.dumps({"op": "begin", "id": self.id}) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        _fsync_directory(self.journal_path.parent)
+
+    def _append(self, record: dict[str, str], sync: bool = False) -> None:
+        if self._handle is None:
+            self._open()
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        if sync:
+            os.fsync(self._handle.fileno())
+
+    def _close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _remove_journal(self) -> None:
+        with self._lock:
+            self._close()
+            if not self._owns_journal:
+                return  # el diario es de otra transacción pendiente de recuperar
+            self._owns_journal = False
+        _remove_quietly(self.journal_path)
+
+
+def recover_install_journal(design_mode: bool, journal_path: Path | None = None) -> None:
+    """Completa o deshace la transacción que dejó a medias una ejecución anterior."""
+    journal_path = journal_path or DEFAULT_INSTALL_JOURNAL_PATH
+    try:
+        journal = _read_install_journal(journal_path)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as exc:
+        _design_log(DESIGN_LOG_INSTALLER, design_mode, logging.WARNING, "[WARN] Diario de instalación ilegible (%s)", exc)
+        _remove_quietly(journal_path)
+        return
+    entries = journal["entries"]
+    if journal["committing"]:
+        failed = _replace_journal_entries(entries, design_mode)
+        _design_log(
+            DESIGN_LOG_INSTALLER,
+            design_mode,
+            logging.INFO,
+            "[JOURNAL] Transacción %s completada: %s reemplazos pendientes, %s fallidos",
+            journal.get("id"),
+            len(entries),
+            len(failed),
+        )
+        if failed:
+            return
+    else:
+        for entry in entries:
+            _remove_quietly(Path(entry["staged"]))
+        _design_log(
+            DESIGN_LOG_INSTALLER,
+            design_mode,
+            logging.INFO,
+            "[JOURNAL] Transacción %s sin confirmar deshecha: %s temporales eliminados",
+            journal.get("id"),
+            len(entries),
+        )
+    _remove_quietly(journal_path)
+
+
+def _read_install_journal(journal_path: Path) -> dict:
+    """Reconstruye id, temporales vivos y si se llegó a "commit"; ignora una última línea cortada."""
+    journal: dict = {"id": None, "entries": [], "committing": False}
+    staged: dict[str, dict[str, str]] = {}
+    with open(journal_path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            op = record.get("op")
+            if op == "begin":
+                journal["id"] = record.get("id")
+            elif op == "stage" and "staged" in record and "destination" in record:
+                staged[record["staged"]] = {"staged": record["staged"], "destination": record["destination"]}
+            elif op == "drop":
+                staged.pop(record.get("staged"), None)
+            elif op == "commit":
+                journal["committing"] = True
+    journal["entries"] = list(staged.values())
+    return journal
+
+
+def _replace_journal_entries(entries: list[dict[str, str]], design_mode: bool) -> list[Path]:
+    failed: list[Path] = []
+    replaced_in: set[Path] = set()
+    for entry in entries:
+        staged, destination = Path(entry["staged"]), Path(entry["destination"])
+        if not staged.exists():
+            continue  # ya reemplazado
+        try:
+            os.replace(staged, destination)
+            replaced_in.add(destination.parent)
+        except OSError as exc:
+            failed.append(destination)
+            _design_log(
+                DESIGN_LOG_INSTALLER,
+                design_mode,
+                logging.ERROR,
+                "[ERROR] No se pudo reemplazar %s (%s)",
+                destination,
+                exc,
+            )
+    for directory in replaced_in:
+        _fsync_directory(directory)
+    return failed
+
+
+def _fsync_directory(directory: Path) -> None:
+    """fsync de la carpeta para que un os.replace sobreviva a un corte de luz (solo POSIX; en Windows no aplica)."""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+# --------------------------------------------------------------------------- #
+# Instalación reanudable
+# --------------------------------------------------------------------------- #
+
+
+class InstallCheckpoint:
+    """Progreso de la instalación en curso (JSON Lines en la carpeta de estado).
+
+    Se añade una línea al empezar cada copia ("begin"), tras su backup ("backup"), al
+    terminarla ("copied") y tras cada escritura MRU ("mru"). Una ejecución que termina
+    borra el archivo; si se corta, la siguiente da por buenas las copias registradas cuyo
+    origen y destino siguen con el mismo tamaño y mtime, y solo verifica el contenido de
+    las que quedaron a medias.
+
+    Se hace fsync cada SYNC_EVERY líneas y siempre tras "backup": esa línea tiene que
+    sobrevivir a un corte de luz antes de que se sobrescriba el destino, o la siguiente
+    ejecución respaldaría el destino a medio escribir.
+    """
+
+    SYNC_EVERY = 32
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or DEFAULT_INSTALL_CHECKPOINT_PATH
+        self.copied_entries: dict[str, dict] = {}
+        self.in_flight: dict[str, bool] = {}  # destino -> backup ya hecho
+        self.mru_written: set[str] = set()
+        self._resumed: set[str] = set()
+        self._lock = threading.Lock()
+        self._handle = None
+        self._unsynced = 0
+
+    @classmethod
+    def load(cls, design_mode: bool, path: Path | None = None) -> "InstallCheckpoint":
+        checkpoint = cls(path)
+        try:
+            lines = checkpoint.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return checkpoint
+        except OSError as exc:
+            _design_log(DESIGN_LOG_INSTALLER, design_mode, logging.WARNING, "[WARN] Checkpoint ilegible (%s)", exc)
+            return checkpoint
+        for line in lines:
+            try:
+                record = json.loads(line)
+                destination = record["destination"]
+            except (ValueError, KeyError, TypeError):
+                continue  # última línea cortada a medias
+            op = record.get("op")
+            if op == "begin":
+                checkpoint.in_flight[destination] = False
+            elif op == "backup":
+                checkpoint.in_flight[destination] = True
+            elif op == "copied":
+                checkpoint.in_flight.pop(destination, None)
+                checkpoint.copied_entries[destination] = record
+            elif op == "mru":
+                checkpoint.mru_written.add(destination)
+        _design_log(
+            DESIGN_LOG_INSTALLER,
+            design_mode,
+            logging.INFO,
+            "[RESUME] Ejecución anterior interrumpida: %s copias completadas, %s en curso",
+            len(checkpoint.copied_entries),
+            len(checkpoint.in_flight),
+        )
+        return checkpoint
+
+    def is_copied(self, job: InstallJob) -> bool:
+        """True si la copia de `job` terminó antes del corte y nada ha cambiado desde entonces."""
+        entry = self.copied_entries.get(str(job.destination))
+        if entry is None or entry.get("source") != str(job.source):
+            return False
+        source_fingerprint = _job_source_fingerprint(job)
+        destination_fingerprint = _file_fingerprint(job.destination)
+        if source_fingerprint is None or destination_fingerprint is None:
+            return False
+        if list(source_fingerprint) != entry.get("source_fingerprint"):
+            return False
+        if list(destination_fingerprint) != entry.get("destination_fingerprint"):
+            return False
+        with self._lock:
+            self._resumed.add(str(job.destination))
+        return True
+
+    def in_flight_state(self, job: InstallJob) -> Optional[bool]:
+        """None si `job` no estaba en curso; si no, True cuando su backup ya se había hecho."""
+        return self.in_flight.get(str(job.destination))
+
+    def mark_resumed(self, job: InstallJob) -> None:
+        with self._lock:
+            self._resumed.add(str(job.destination))
+
+    def mru_done(self, job: InstallJob) -> bool:
+        """El MRU solo se omite para copias reanudadas (un desinstalador intermedio lo habría borrado)."""
+        destination = str(job.destination)
+        return destination in self.mru_written and destination in self._resumed
+
+    def begin(self, job: InstallJob) -> None:
+        self._append({"op": "begin", "destination": str(job.destination)})
+
+    def backed_up(self, job: InstallJob) -> None:
+        self._append({"op": "backup", "destination": str(job.destination)}, sync=True)
+
+    def copied(self, job: InstallJob) -> None:
+        source_fingerprint = _job_source_fingerprint(job)
+        destination_fingerprint = _file_fingerprint(job.destination)
+        self._append(
+            {
+                "op": "copied",
+                "destination": str(job.destination),
+                "source": str(job.source),
+                "source_fingerprint": list(source_fingerprint) if source_fingerprint else None,
+                "destination_fingerprint": list(destination_fingerprint) if destination_fingerprint else None,
+            }
+        )
+
+    def mru(self, job: InstallJob) -> None:
+        self._append({"op": "mru", "destination": str(job.destination)})
+
+    def finish(self) -> None:
+        """La ejecución terminó: la siguiente empieza de cero."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+        _remove_quietly(self.path)
+
+    def _append(self, record: dict, sync: bool = False) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._handle is None:
+                ensure_directory(self.path.parent)
+                self._handle = open(self.path, "a", encoding="utf-8")
+            self._handle.write(line)
+            self._handle.flush()
+            self._unsynced += 1
+            if sync or self._unsynced >= self.SYNC_EVERY:
+                os.fsync(self._handle.fileno())
+                self._unsynced = 0
+
+
+def _job_source_fingerprint(job: InstallJob) -> Optional[tuple[int, int]]:
+    return job.member.fingerprint if job.member is not None else _file_fingerprint(job.source)
+
+
+def _resume_from_checkpoint(job: InstallJob, checkpoint: InstallCheckpoint) -> Optional[_PreparedJob]:
+    """Trabajo ya instalado por la ejecución interrumpida (no se valida, copia ni respalda)."""
+    if not checkpoint.is_copied(job):
+        return None
+    return _PreparedJob(job, AuthorCheckResult(True, "Checkpoint", []), resumed=True, checkpoint=checkpoint)
+
+
+def _verify_in_flight(prepared: _PreparedJob, checkpoint: InstallCheckpoint) -> None:
+    """Comprueba la única operación que quedó a medias: si el destino ya es idéntico no se
+    repite; si no, se vuelve a copiar sin repetir el backup (el destino puede estar truncado)."""
+    job = prepared.job
+    backed_up = checkpoint.in_flight_state(job)
+    if backed_up is None or prepared.verdict is None or not prepared.verdict.allowed:
+        return
+    if destination_unchanged(job.source, job.destination, prepared.data, job.member.fingerprint if job.member else None):
+        prepared.resumed = True
+        checkpoint.mark_resumed(job)
+    elif backed_up:
+        prepared.backup = False
+
+
+# --------------------------------------------------------------------------- #
+# Copia paralela por destino
+# --------------------------------------------------------------------------- #
+
+
+class CopyScheduler:
+    """Ejecuta copias en paralelo con un máximo de hilos por dispositivo o recurso compartido."""
+
+    def __init__(self, workers_per_device: int) -> None:
+        self.workers_per_device = max(1, workers_per_device)
+        self._executors: dict[tuple[str, object], ThreadPoolExecutor] = {}
+        self._devices: dict[Path, tuple[str, object]] = {}
+
+    def submit(self, destination_root: Path, func: Callable[..., _R], *args) -> Future:
+        device = self._devices.get(destination_root)
+        if device is None:
+            device = self._devices[destination_root] = destination_device(destination_root)
+        executor = self._executors.get(device)
+        if executor is None:
+            executor = self._executors[device] = ThreadPoolExecutor(
+                max_workers=self.workers_per_device, thread_name_prefix=f"install-copy-{len(self._executors)}"
+            )
+        return executor.submit(func, *args)
+
+    def close(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        self._executors.clear()
+
+    def __enter__(self) -> "CopyScheduler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def destination_device(path: Path) -> tuple[str, object]:
+    """Clave del dispositivo de `path`: el recurso \\\\servidor\\recurso en rutas UNC o st_dev."""
+    text = str(path)
+    if text.startswith("\\\\"):
+        server_share = text.lstrip("\\").split("\\")[:2]
+        return ("share", "\\".join(server_share).lower())
+    for candidate in (path, *path.parents):
+        try:
+            return ("device", os.stat(candidate).st_dev)
+        except OSError:
+            continue
+    return ("path", text.lower())
+
+
+# --------------------------------------------------------------------------- #
+# Deduplicación por contenido
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class _LinkClaim:
+    """Primera copia de un contenido en un dispositivo; las demás esperan a `ready` y la enlazan."""
+
+    ready: threading.Event = field(default_factory=threading.Event)
+    path: Optional[Path] = None  # lo que escribió la primera copia; None si falló
+
+
+class ContentLinker:
+    """Recuerda qué contenido se instaló ya en cada dispositivo para enlazarlo en vez de copiarlo.
+
+    Las plantillas base (Normal.dotm...) nunca se enlazan: Office las modifica en su sitio
+    y el cambio se vería en todas las rutas enlazadas.
+
+    El contenido se reserva (claim) antes de copiarlo, no después: con --copy-workers dos
+    archivos iguales copiándose a la vez no pueden acabar los dos como copias; el segundo
+    espera a que termine el primero y lo enlaza.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hashes: dict[Path, Optional[str]] = {}
+        self._claims: dict[tuple[str, tuple[str, object]], _LinkClaim] = {}
+
+    def content_hash(self, source: Path, data: bytes | None = None) -> Optional[str]:
+        with self._lock:
+            if source in self._hashes:
+                return self._hashes[source]
+        digest = hashlib.sha256(data).hexdigest() if data is not None else _sha256_file(source)
+        with self._lock:
+            self._hashes[source] = digest
+        return digest
+
+    def claim(self, digest: str, destination_root: Path) -> tuple[_LinkClaim, bool]:
+        """(reserva, True si quien llama hace la copia y debe llamar a fulfil)."""
+        key = (digest, destination_device(destination_root))
+        with self._lock:
+            claim = self._claims.get(key)
+            if claim is not None and not (claim.ready.is_set() and claim.path is None):
+                return claim, False
+            claim = self._claims[key] = _LinkClaim()
+            return claim, True
+
+    @staticmethod
+    def fulfil(claim: _LinkClaim, written: Optional[Path]) -> None:
+        claim.path = written
+        claim.ready.set()
+
+    @staticmethod
+    def wait(claim: _LinkClaim) -> Optional[Path]:
+        claim.ready.wait()
+        existing = claim.path
+        return existing if existing is not None and existing.exists() else None
+
+
+def link_into_place(existing: Path, destination: Path) -> None:
+    """Sustituye `destination` por un enlace duro a `existing` (os.link + os.replace)."""
+    ensure_directory(destination.parent)
+    temp_path = destination.with_name(f".{destination.name}.link.tmp")
+    _remove_quietly(temp_path)
+    os.link(existing, temp_path)
+    try:
+        os.replace(temp_path, destination)
+    except OSError:
+        _remove_quietly(temp_path)
+        raise
+
+
+def log_dedup_savings(flags: InstallFlags, design_mode: bool) -> None:
+    linked = int(flags.stats.get("dedup_files", 0))
+    if not linked:
+        return
+    _design_log(
+        DESIGN_LOG_INSTALLER,
+        design_mode,
+        logging.INFO,
+        "[DEDUP] %s archivos instalados como enlaces duros; %.1f MiB sin copiar.",
+        linked,
+        flags.stats.get("dedup_bytes", 0) / (1024 * 1024),
+    )
 
 
 # --------------------------------------------------------------------------- #
@@ -425,7 +2258,126 @@ class InstallFlags:
     custom_selection: Optional[Path] = None
     roaming_selection: Optional[Path] = None
     excel_startup_selection: Optional[Path] = None
-    totals: dict[str, int] = field(default_factory=lambda: {"files": 0, "errors": 0, "blocked": 0})
+    totals: dict[str, int] = field(
+        default_factory=lambda: {"files": 0, "errors": 0, "blocked": 0, "corrupt": 0, "unchanged": 0}
+    )
+    stats: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class InstallOptions:
+    """Opciones de una ejecución que cambian cómo se procesa cada archivo."""
+
+    verify_integrity: bool = DEFAULT_VERIFY_INTEGRITY
+    incremental: bool = DEFAULT_INCREMENTAL_INSTALL
+    transactional: bool = DEFAULT_TRANSACTIONAL_INSTALL
+    resumable: bool = DEFAULT_RESUMABLE_INSTALL
+    copy_backend: str = DEFAULT_COPY_BACKEND
+    backup_layout: str = DEFAULT_BACKUP_LAYOUT
+    backup_strategy: str = DEFAULT_BACKUP_STRATEGY
+    dedupe: bool = DEFAULT_DEDUPE_INSTALL
+
+
+BASE_INSTALL_TARGETS = (
+    ("WORD", "Normal.dotx"),
+    ("WORD", "Normal.dotm"),
+    ("WORD", "NormalEmail.dotx"),
+    ("WORD", "NormalEmail.dotm"),
+    ("POWERPOINT", "Blank.potx"),
+    ("POWERPOINT", "Blank.potm"),
+    ("EXCEL", "Book.xltx"),
+    ("EXCEL", "Book.xltm"),
+    ("EXCEL", "Sheet.xltx"),
+    ("EXCEL", "Sheet.xltm"),
+)
+
+
+@dataclass
+class InstallJob:
+    """Un archivo de la payload y su carpeta destino."""
+
+    app_label: str
+    filename: str
+    source: Path
+    destination_root: Path
+    base: bool = False
+    member: Optional[PayloadMember] = None  # origen dentro de una payload empaquetada
+
+    @property
+    def destination(self) -> Path:
+        return self.destination_root / self.filename
+
+    @property
+    def extension(self) -> str:
+        return Path(self.filename).suffix.lower()
+
+
+@dataclass
+class _PreparedJob:
+    job: InstallJob
+    verdict: Optional[AuthorCheckResult]  # None: el origen no existe
+    data: Optional[bytes] = None
+    integrity_error: Optional[str] = None
+    verified_bytes: int = 0
+    verify_seconds: float = 0.0
+    unchanged: bool = False
+    copy_backend: str = DEFAULT_COPY_BACKEND
+    backup_layout: str = DEFAULT_BACKUP_LAYOUT
+    backup_strategy: str = DEFAULT_BACKUP_STRATEGY
+    backup: bool = False
+    linker: Optional["ContentLinker"] = None
+    linked_bytes: int = 0
+    checkpoint: Optional[InstallCheckpoint] = None
+    catalog: Optional["BackupCatalog"] = None
+    resumed: bool = False  # ya copiado por una ejecución interrumpida
+
+
+def collect_install_jobs(base_dir: Path, destinations: dict[str, Path], design_mode: bool = False) -> list[InstallJob]:
+    """Plantillas base (aunque falten en la payload) seguidas de las personalizadas."""
+    base_dir = normalize_path(base_dir)
+    members = load_payload_members(base_dir)
+    jobs = [
+        InstallJob(
+            app_label,
+            filename,
+            normalize_path(base_dir / filename),
+            normalize_path(destinations[app_label]),
+            base=True,
+            member=members.get(filename) if members is not None else None,
+        )
+        for app_label, filename in BASE_INSTALL_TARGETS
+    ]
+    return jobs + _custom_install_jobs(base_dir, destinations, design_mode, members)
+
+
+def _custom_install_jobs(
+    base_dir: Path,
+    destinations: dict[str, Path],
+    design_mode: bool,
+    members: dict[str, PayloadMember] | None = None,
+) -> list[InstallJob]:
+    jobs: list[InstallJob] = []
+    files = iter_template_files(base_dir) if members is None else (base_dir / name for name in members)
+    for file in files:
+        filename = file.name
+        extension = file.suffix.lower()
+        if filename in BASE_TEMPLATE_NAMES:
+            continue
+        if extension in {".xltx", ".xltm"}:
+            destination_root = destinations["EXCEL_CUSTOM"]
+        elif extension in {".dotx", ".dotm"}:
+            destination_root = destinations["WORD_CUSTOM"]
+        elif extension in {".potx", ".potm"}:
+            destination_root = destinations["POWERPOINT_CUSTOM"]
+        else:
+            destination_root = _destination_for_extension(extension, destinations)
+        if destination_root is None:
+            _design_log(DESIGN_LOG_COPY_CUSTOM, design_mode, logging.WARNING, "[WARNING] No hay destino para %s", filename)
+            continue
+        role = payload_destination_role(filename)
+        member = members.get(filename) if members is not None else None
+        jobs.append(InstallJob(role[0] if role else "", filename, normalize_path(file), destination_root, member=member))
+    return jobs
 
 
 def install_template(
@@ -435,42 +2387,540 @@ def install_template(
     destination_root: Path,
     destinations_map: dict[str, Path],
     flags: InstallFlags,
-    allowed_authors: Iterable[str],
+    allowed_authors: Iterable[str] | AuthorPolicy,
     validation_enabled: bool,
     design_mode: bool,
+    verdicts: dict[Path, AuthorCheckResult] | None = None,
+    cache: AuthorCache | None = None,
 ) -> None:
-    source = normalize_path(source_root / filename)
-    destination_root = ensure_directory(normalize_path(destination_root))
-    destination = destination_root / filename
+    job = InstallJob(app_label, filename, normalize_path(source_root / filename), normalize_path(destination_root), base=True)
+    install_jobs([job], destinations_map, flags, allowed_authors, validation_enabled, design_mode, verdicts, cache)
 
-    if not source.exists():
-        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.WARNING, "[WARNING] Archivo fuente no encontrado: %s", source)
-        flags.totals["errors"] += 1
+
+def copy_custom_templates(
+    base_dir: Path,
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    allowed: Iterable[str] | AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    verdicts: dict[Path, AuthorCheckResult] | None = None,
+    cache: AuthorCache | None = None,
+) -> None:
+    jobs = _custom_install_jobs(base_dir, destinations, design_mode)
+    install_jobs(jobs, destinations, flags, allowed, validation_enabled, design_mode, verdicts, cache)
+
+
+def install_jobs(
+    jobs: list[InstallJob],
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    allowed_authors: Iterable[str] | AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    verdicts: dict[Path, AuthorCheckResult] | None = None,
+    cache: AuthorCache | None = None,
+    pipeline: bool = False,
+    workers: int = 1,
+    queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE,
+    options: InstallOptions | None = None,
+    copy_workers: int = DEFAULT_COPY_WORKERS,
+) -> None:
+    """Valida, copia y registra en MRU cada trabajo.
+
+    Con `pipeline` las tres etapas corren a la vez unidas por colas acotadas: la validación
+    (con hasta `workers` hilos) se bloquea cuando la copia va atrasada. La etapa de copia es
+    un único hilo que procesa en el orden de entrada, así que flags y totales son los mismos
+    que en modo secuencial.
+
+    Con `copy_workers` > 0 las copias corren en paralelo por dispositivo de destino
+    (ver _commit_in_order).
+
+    Con `options.transactional` las copias se preparan como temporales y se reemplazan
+    todas juntas al final (ver InstallTransaction); el MRU se actualiza después de ese
+    reemplazo.
+
+    Con `options.resumable` el progreso se registra en un InstallCheckpoint y se retoma
+    una ejecución anterior que no llegó al final.
+    """
+    policy = compile_author_policy(allowed_authors)
+    options = options or InstallOptions()
+    linker = ContentLinker() if options.dedupe else None
+    checkpoint = InstallCheckpoint.load(design_mode) if options.resumable else None
+    catalog = BackupCatalog()
+
+    def _prepare(job: InstallJob) -> _PreparedJob:
+        if checkpoint is not None:
+            resumed = _resume_from_checkpoint(job, checkpoint)
+            if resumed is not None:
+                return resumed
+        prepared = _prepare_install_job(job, policy, validation_enabled, design_mode, verdicts, cache, options)
+        prepared.linker = linker
+        prepared.catalog = catalog
+        if checkpoint is not None:
+            prepared.checkpoint = checkpoint
+            _verify_in_flight(prepared, checkpoint)
+        return prepared
+
+    update_mru = _checkpointed_mru_update(checkpoint, options, design_mode)
+
+    def _run(transaction: InstallTransaction | None, on_copied: Callable[[InstallJob], None] | None) -> None:
+        _run_install_stages(
+            jobs,
+            _prepare,
+            destinations,
+            flags,
+            design_mode,
+            pipeline,
+            workers,
+            queue_size,
+            transaction,
+            on_copied,
+            copy_workers,
+            update_mru,
+        )
+
+    _run_maybe_transactional(_run, options, flags, destinations, design_mode, update_mru)
+    catalog.finish(design_mode)
+    if checkpoint is not None:
+        checkpoint.finish()
+
+
+def _checkpointed_mru_update(
+    checkpoint: InstallCheckpoint | None,
+    options: InstallOptions,
+    design_mode: bool,
+    applies: Callable[[InstallJob], bool] = lambda job: True,
+) -> Callable[[InstallJob], None]:
+    """Actualización MRU de cada copia terminada que además la anota en `checkpoint`.
+
+    En modo transaccional las copias se anotan aquí, tras el reemplazo, y no al prepararlas.
+    """
+
+    def _update(job: InstallJob) -> None:
+        if checkpoint is None:
+            if applies(job):
+                _update_mru_for_job(job, design_mode)
+            return
+        if options.transactional:
+            checkpoint.copied(job)
+        if checkpoint.mru_done(job):
+            return
+        if applies(job):
+            _update_mru_for_job(job, design_mode)
+        checkpoint.mru(job)
+
+    return _update
+
+
+def _run_maybe_transactional(
+    run: Callable[[InstallTransaction | None, Callable[[InstallJob], None] | None], None],
+    options: InstallOptions,
+    flags: InstallFlags,
+    destinations: dict[str, Path],
+    design_mode: bool,
+    update_mru: Callable[[InstallJob], None],
+) -> None:
+    """Ejecuta `run` directamente o dentro de una InstallTransaction (MRU tras el reemplazo).
+
+    Si algún reemplazo falla, carpetas a abrir y selecciones se recalculan solo con los
+    archivos que sí quedaron instalados.
+    """
+    if not options.transactional:
+        run(None, None)
         return
+    transaction = InstallTransaction()
+    transaction.begin()  # antes de preparar nada: falla si queda un diario sin recuperar
+    before = {name: value for name, value in vars(flags).items() if name not in ("totals", "stats")}
+    staged_jobs: list[InstallJob] = []
+    try:
+        run(transaction, staged_jobs.append)
+    except BaseException:
+        transaction.rollback()
+        raise
+    failed = set(transaction.commit(design_mode))
+    flags.totals["files"] -= len(failed)
+    flags.totals["errors"] += len(failed)
+    if failed:
+        for name, value in before.items():
+            setattr(flags, name, value)
+        for job in staged_jobs:
+            if job.destination not in failed:
+                _apply_install_flags(job, flags, destinations)
+    _design_log(
+        DESIGN_LOG_INSTALLER,
+        design_mode,
+        logging.INFO,
+        "[COMMIT] Transacción %s: %s archivos reemplazados, %s pendientes",
+        transaction.id,
+        len(staged_jobs) - len(failed),
+        len(failed),
+    )
+    for job in staged_jobs:
+        if job.destination not in failed:
+            update_mru(job)
 
-    author_check = check_template_author(
-        source,
-        allowed_authors=allowed_authors,
-        validation_enabled=validation_enabled,
-        design_mode=design_mode,
+
+def _run_install_stages(
+    jobs: list[InstallJob],
+    prepare: Callable[[InstallJob], _PreparedJob],
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    design_mode: bool,
+    pipeline: bool,
+    workers: int,
+    queue_size: int,
+    transaction: InstallTransaction | None = None,
+    defer_mru: Callable[[InstallJob], None] | None = None,
+    copy_workers: int = 0,
+    update_mru: Callable[[InstallJob], None] | None = None,
+) -> None:
+    update_mru = update_mru or (lambda job: _update_mru_for_job(job, design_mode))
+    if not pipeline:
+        on_copied = defer_mru or update_mru
+        prepared_jobs = (prepare(job) for job in jobs)
+        _commit_in_order(prepared_jobs, destinations, flags, design_mode, transaction, on_copied, copy_workers)
+        return
+
+    done = object()
+    validated: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+    mru_pending: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+    failures: list[BaseException] = []
+    stop = threading.Event()  # la copia falló: la validación deja de producir
+    drained = threading.Event()  # la copia ya recibió `done`
+
+    def _validation_stage() -> None:
+        results = _map_bounded(prepare, jobs, workers)
+        try:
+            for prepared in results:
+                if stop.is_set():
+                    break
+                validated.put(prepared)
+        except BaseException as exc:  # noqa: BLE001 - se relanza en el hilo principal
+            failures.append(exc)
+        finally:
+            results.close()
+            validated.put(done)
+
+    def _mru_stage() -> None:
+        while True:
+            job = mru_pending.get()
+            if job is done:
+                return
+            try:
+                update_mru(job)
+            except BaseException as exc:  # noqa: BLE001
+                failures.append(exc)
+
+    stages = [
+        threading.Thread(target=_validation_stage, name="install-validate", daemon=True),
+        threading.Thread(target=_mru_stage, name="install-mru", daemon=True),
+    ]
+
+    def _validated_jobs() -> Iterator[_PreparedJob]:
+        while True:
+            prepared = validated.get()
+            if prepared is done:
+                drained.set()
+                return
+            yield prepared
+
+    for stage in stages:
+        stage.start()
+    try:
+        on_copied = defer_mru or mru_pending.put
+        _commit_in_order(_validated_jobs(), destinations, flags, design_mode, transaction, on_copied, copy_workers)
+    finally:
+        # Si la copia se cortó, la validación puede estar bloqueada en una cola llena: se le
+        # pide que pare y se vacía la cola hasta su `done` para poder esperarla.
+        stop.set()
+        while not drained.is_set():
+            if validated.get() is done:
+                drained.set()
+        stages[0].join()
+        mru_pending.put(done)
+        stages[1].join()
+    if failures:
+        raise failures[0]
+
+
+def _payload_read_error(job: InstallJob, exc: Exception) -> AuthorCheckResult:
+    return AuthorCheckResult(False, f"[ERROR] {job.filename}: no se pudo leer de la payload ({exc}).", [], error=True)
+
+
+def _prepare_install_job(
+    job: InstallJob,
+    policy: AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    verdicts: dict[Path, AuthorCheckResult] | None,
+    cache: AuthorCache | None,
+    options: InstallOptions,
+) -> _PreparedJob:
+    if job.member is not None:
+        try:
+            data = job.member.read()
+        except (OSError, ValueError, zipfile.BadZipFile) as exc:
+            return _PreparedJob(job, _payload_read_error(job, exc))
+        verdict = check_payload_member(job.source, job.member, data, policy, validation_enabled)
+    elif not job.source.exists():
+        return _PreparedJob(job, None)
+    else:
+        verdict, data = _author_check_for_copy(job.source, policy, validation_enabled, design_mode, verdicts, cache)
+    prepared = _PreparedJob(
+        job,
+        verdict,
+        data,
+        copy_backend=options.copy_backend,
+        backup_layout=options.backup_layout,
+        backup_strategy=options.backup_strategy,
+        backup=job.base,
     )
-    if not author_check.allowed:
-        _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, author_check.message)
-        flags.totals["blocked"] += 1
+    if options.verify_integrity and verdict.allowed:
+        if prepared.data is None:
+            # Veredicto previo (--jobs), caché o archivo mayor que SINGLE_READ_MAX_BYTES: se lee
+            # una vez sin límite y esos mismos bytes se verifican y se copian.
+            prepared.data = read_template_bytes(job.source, sys.maxsize)
+        start = time.perf_counter()
+        if prepared.data is not None:
+            prepared.integrity_error = verify_package(prepared.data)
+            prepared.verified_bytes = len(prepared.data)
+        else:
+            prepared.integrity_error = "no se pudo leer el origen"
+        prepared.verify_seconds = time.perf_counter() - start
+    if options.incremental and verdict.allowed and not prepared.integrity_error:
+        prepared.unchanged = destination_unchanged(
+            job.source, job.destination, prepared.data, job.member.fingerprint if job.member else None
+        )
+    return prepared
+
+
+def _commit_in_order(
+    prepared_jobs: Iterable[_PreparedJob],
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    design_mode: bool,
+    transaction: InstallTransaction | None,
+    on_copied: Callable[[InstallJob], None],
+    copy_workers: int = 0,
+) -> None:
+    """Confirma los trabajos en orden de entrada.
+
+    Con `copy_workers` > 0 el backup y la copia de cada trabajo se envían a un
+    CopyScheduler (hasta `copy_workers` hilos por dispositivo o recurso compartido de
+    destino), pero totales, flags y MRU se registran aquí en el orden original, así que
+    el resultado es el mismo que en modo secuencial.
+    """
+    if copy_workers <= 0:
+        for prepared in prepared_jobs:
+            if _commit_install_job(prepared, destinations, flags, design_mode, transaction):
+                on_copied(prepared.job)
         return
 
-    backup_existing(destination, design_mode)
+    pending: deque[tuple[_PreparedJob, Future]] = deque()
+    in_flight_limit = 4 * copy_workers
+
+    def _settle(wait_all: bool) -> None:
+        while pending and (wait_all or len(pending) >= in_flight_limit or pending[0][1].done()):
+            prepared, future = pending.popleft()
+            if _record_install_copy(prepared, destinations, flags, design_mode, future.exception()):
+                on_copied(prepared.job)
+
+    with CopyScheduler(copy_workers) as scheduler:
+        for prepared in prepared_jobs:
+            if _should_copy_install_job(prepared, flags, design_mode):
+                future = scheduler.submit(
+                    prepared.job.destination_root, _copy_install_job, prepared, design_mode, transaction
+                )
+                pending.append((prepared, future))
+            _settle(wait_all=False)
+        _settle(wait_all=True)
+
+
+def _commit_install_job(
+    prepared: _PreparedJob,
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    design_mode: bool,
+    transaction: InstallTransaction | None = None,
+) -> bool:
+    """Backup, copia (o preparación dentro de `transaction`) y flags de un trabajo ya validado. True si se copió."""
+    if not _should_copy_install_job(prepared, flags, design_mode):
+        return False
     try:
-        ensure_parents_and_copy(source, destination)
-        flags.totals["files"] += 1
-        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.INFO, "[OK] Copiado %s a %s", filename, destination)
-        _mark_folder_open_flag(destination_root, flags, destinations_map)
-        _update_mru_if_applicable(app_label, destination, design_mode)
+        _copy_install_job(prepared, design_mode, transaction)
     except OSError as exc:
+        return _record_install_copy(prepared, destinations, flags, design_mode, exc)
+    return _record_install_copy(prepared, destinations, flags, design_mode, None)
+
+
+def _should_copy_install_job(prepared: _PreparedJob, flags: InstallFlags, design_mode: bool) -> bool:
+    """Cuenta los trabajos que no se copian (origen ausente, bloqueado, dañado o sin cambios)."""
+    job = prepared.job
+    if job.base:
+        ensure_directory(job.destination_root)
+    if prepared.verified_bytes:
+        flags.stats["verified_bytes"] = flags.stats.get("verified_bytes", 0) + prepared.verified_bytes
+        flags.stats["verify_seconds"] = flags.stats.get("verify_seconds", 0.0) + prepared.verify_seconds
+    reason, detail = _skip_reason(prepared)
+    if reason is None:
+        return True
+    _count_skipped_job(job, reason, detail, flags, design_mode)
+    return False
+
+
+def _skip_reason(prepared: _PreparedJob) -> tuple[Optional[str], str]:
+    """("missing" | "blocked" | "corrupt" | "unchanged" | None, detalle)."""
+    if prepared.verdict is None:
+        return "missing", ""
+    if not prepared.verdict.allowed:
+        return "blocked", prepared.verdict.message
+    if prepared.integrity_error:
+        return "corrupt", prepared.integrity_error
+    if prepared.unchanged:
+        return "unchanged", ""
+    return None, ""
+
+
+def _count_skipped_job(job: InstallJob, reason: str, detail: str, flags: InstallFlags, design_mode: bool) -> None:
+    log_flag = DESIGN_LOG_COPY_BASE if job.base else DESIGN_LOG_COPY_CUSTOM
+    if reason == "missing":
+        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.WARNING, "[WARNING] Archivo fuente no encontrado: %s", job.source)
+        flags.totals["errors"] += 1
+    elif reason == "blocked":
+        _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, detail)
+        flags.totals["blocked"] += 1
+    elif reason == "corrupt":
+        _design_log(log_flag, design_mode, logging.ERROR, "[CORRUPT] %s no se instala: paquete dañado (%s)", job.filename, detail)
+        flags.totals["corrupt"] += 1
+    elif reason == "unchanged":
+        _design_log(log_flag, design_mode, logging.INFO, "[SKIP] %s sin cambios en %s", job.filename, job.destination)
+        flags.totals["unchanged"] += 1
+    else:
+        _design_log(log_flag, design_mode, logging.WARNING, "[WARNING] %s no se instala (%s)", job.filename, detail or reason)
         flags.totals["errors"] += 1
-        _design_log(DESIGN_LOG_COPY_BASE, design_mode, logging.ERROR, "[ERROR] Falló la copia de %s (%s)", filename, exc)
+
+
+def _copy_install_job(prepared: _PreparedJob, design_mode: bool, transaction: InstallTransaction | None) -> None:
+    """Backup y copia; puede ejecutarse en un hilo del CopyScheduler (no toca flags).
+
+    Con la estrategia de backup "rename" el destino se mueve a Backups antes de escribir el
+    nuevo (en modo transaccional se enlaza, ver place_backup); si la copia falla, se restaura.
+    """
+    job = prepared.job
+    if prepared.resumed:
         return
+    checkpoint = prepared.checkpoint if transaction is None else None
+    if checkpoint is not None:
+        checkpoint.begin(job)
+    moved_to: Optional[Path] = None
+    if prepared.backup:
+        strategy = prepared.backup_strategy
+        if transaction is not None and strategy == "rename":
+            strategy = "link"
+        moved_to = backup_existing(job.destination, design_mode, prepared.backup_layout, strategy, prepared.catalog)
+        if checkpoint is not None:
+            checkpoint.backed_up(job)
+    try:
+        _place_install_copy(prepared, transaction, checkpoint)
+    except OSError:
+        if moved_to is not None:
+            restore_moved_backup(moved_to, job.destination)
+        raise
+
 
+def _place_install_copy(
+    prepared: _PreparedJob,
+    transaction: InstallTransaction | None,
+    checkpoint: InstallCheckpoint | None,
+) -> None:
+    job = prepared.job
+    linker = prepared.linker if not job.base else None
+    digest = linker.content_hash(job.source, prepared.data) if linker is not None else None
+    claim: Optional[_LinkClaim] = None
+    if linker is not None and digest is not None:
+        claim, owner = linker.claim(digest, job.destination_root)
+        if not owner:
+            existing = linker.wait(claim)
+            claim = None
+            if existing is not None:
+                try:
+                    if transaction is not None:
+                        transaction.stage(job.source, job.destination, link_from=existing)
+                    else:
+                        link_into_place(existing, job.destination)
+                        if checkpoint is not None:
+                            checkpoint.copied(job)
+                    # Tamaño de la payload, no del destino (que en modo transaccional aún no existe).
+                    if prepared.data is not None:
+                        prepared.linked_bytes = len(prepared.data)
+                    else:
+                        prepared.linked_bytes = (_job_source_fingerprint(job) or (0, 0))[0]
+                    return
+                except OSError:
+                    pass  # sin enlaces duros (FAT32, algunos recursos SMB...): se copia
+    written: Optional[Path] = None
+    try:
+        mtime_ns = job.member.mtime_ns if job.member is not None else None
+        if transaction is not None:
+            written = transaction.stage(job.source, job.destination, prepared.data, prepared.copy_backend, mtime_ns=mtime_ns)
+        else:
+            ensure_parents_and_copy(job.source, job.destination, prepared.data, prepared.copy_backend, mtime_ns)
+            written = job.destination
+            if checkpoint is not None:
+                checkpoint.copied(job)
+    finally:
+        if claim is not None:
+            ContentLinker.fulfil(claim, written)
+
+
+def _record_install_copy(
+    prepared: _PreparedJob,
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    design_mode: bool,
+    error: BaseException | None,
+) -> bool:
+    job = prepared.job
+    log_flag = DESIGN_LOG_COPY_BASE if job.base else DESIGN_LOG_COPY_CUSTOM
+    if error is not None:
+        if not isinstance(error, OSError):
+            raise error
+        flags.totals["errors"] += 1
+        _design_log(log_flag, design_mode, logging.ERROR, "[ERROR] Falló la copia de %s (%s)", job.filename, error)
+        return False
+    flags.totals["files"] += 1
+    if prepared.linked_bytes:
+        flags.stats["dedup_files"] = flags.stats.get("dedup_files", 0) + 1
+        flags.stats["dedup_bytes"] = flags.stats.get("dedup_bytes", 0) + prepared.linked_bytes
+        _design_log(log_flag, design_mode, logging.INFO, "[OK] Enlazado %s a %s (contenido repetido)", job.filename, job.destination)
+    elif prepared.resumed:
+        _design_log(log_flag, design_mode, logging.INFO, "[RESUME] %s ya estaba instalado en %s", job.filename, job.destination)
+    else:
+        _design_log(log_flag, design_mode, logging.INFO, "[OK] Copiado %s a %s", job.filename, job.destination)
+    _apply_install_flags(job, flags, destinations)
+    return True
+
+
+def _apply_install_flags(job: InstallJob, flags: InstallFlags, destinations: dict[str, Path]) -> None:
+    """Carpetas a abrir, aplicaciones y selecciones que implica haber instalado `job`."""
+    _mark_folder_open_flag(job.destination_root, flags, destinations)
+    if job.base:
+        _apply_base_install_flags(job, flags)
+    else:
+        _apply_custom_install_flags(job, flags)
+
+
+def _update_mru_for_job(job: InstallJob, design_mode: bool) -> None:
+    if job.base:
+        _update_mru_if_applicable(job.app_label, job.destination, design_mode)
+    else:
+        _update_mru_if_applicable_extension(job.extension, job.destination, design_mode)
+
+
+def _apply_base_install_flags(job: InstallJob, flags: InstallFlags) -> None:
+    app_label, filename = job.app_label, job.filename
+    destination_root, destination = job.destination_root, job.destination
     if app_label == "WORD":
         flags.open_word = True
         if destination_root == DEFAULT_ROAMING_TEMPLATE_FOLDER:
@@ -495,76 +2945,56 @@ def install_template(
         flags.document_theme_selection = destination
 
 
-def copy_custom_templates(base_dir: Path, destinations: dict[str, Path], flags: InstallFlags, allowed: Iterable[str], validation_enabled: bool, design_mode: bool) -> None:
-    for file in iter_template_files(base_dir):
-        filename = file.name
-        extension = file.suffix.lower()
-        if filename in BASE_TEMPLATE_NAMES:
-            continue
-        if extension in {".xltx", ".xltm"}:
-            destination_root = destinations["EXCEL_CUSTOM"]
-        elif extension in {".dotx", ".dotm"}:
-            destination_root = destinations["WORD_CUSTOM"]
-        elif extension in {".potx", ".potm"}:
-            destination_root = destinations["POWERPOINT_CUSTOM"]
-        else:
-            destination_root = _destination_for_extension(extension, destinations)
-        if destination_root is None:
-            _design_log(DESIGN_LOG_COPY_CUSTOM, design_mode, logging.WARNING, "[WARNING] No hay destino para %s", filename)
-            continue
-
-        result = check_template_author(
-            file,
-            allowed_authors=allowed,
-            validation_enabled=validation_enabled,
-            design_mode=design_mode,
-        )
-        if not result.allowed:
-            flags.totals["blocked"] += 1
-            _design_log(DESIGN_LOG_AUTHOR, design_mode, logging.WARNING, result.message)
-            continue
-
-        try:
-            ensure_parents_and_copy(file, destination_root / filename)
-            flags.totals["files"] += 1
-            _mark_folder_open_flag(destination_root, flags, destinations)
-            _design_log(
-                DESIGN_LOG_COPY_CUSTOM,
-                design_mode,
-                logging.INFO,
-                "[OK] Copiado %s a %s",
-                filename,
-                destination_root / filename,
-            )
-            _update_mru_if_applicable_extension(extension, destination_root / filename, design_mode)
-        except OSError as exc:
-            flags.totals["errors"] += 1
-            _design_log(DESIGN_LOG_COPY_CUSTOM, design_mode, logging.ERROR, "[ERROR] Falló la copia de %s (%s)", filename, exc)
-            continue
+def _apply_custom_install_flags(job: InstallJob, flags: InstallFlags) -> None:
+    extension, destination_root, filename = job.extension, job.destination_root, job.filename
+    if extension in {".dotx", ".dotm"}:
+        flags.open_word = True
+    if extension in {".potx", ".potm"}:
+        flags.open_ppt = True
+    if extension in {".xltx", ".xltm"}:
+        flags.open_excel = True
+    if destination_root == DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH:
+        flags.open_custom_word_folder = True
+    if destination_root == DEFAULT_POWERPOINT_TEMPLATE_PATH or destination_root == DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH:
+        flags.open_custom_ppt_folder = True
+    if destination_root == DEFAULT_EXCEL_TEMPLATE_PATH or destination_root == DEFAULT_CUSTOM_OFFICE_ADDITIONAL_TEMPLATE_PATH:
+        flags.open_custom_excel_folder = True
+    if destination_root == DEFAULT_ROAMING_TEMPLATE_FOLDER:
+        flags.roaming_selection = destination_root / filename
+        flags.open_roaming_folder = True
+    if destination_root == DEFAULT_EXCEL_STARTUP_FOLDER:
+        flags.excel_startup_selection = destination_root / filename
+        flags.open_excel_startup_folder = True
+    if extension == ".thmx":
+        flags.open_document_theme = True
+        flags.document_theme_selection = destination_root / filename
+    if destination_root in {DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH, DEFAULT_CUSTOM_OFFICE_ADDITIONAL_TEMPLATE_PATH}:
+        flags.custom_selection = flags.custom_selection or destination_root / filename
 
-        if extension in {".dotx", ".dotm"}:
-            flags.open_word = True
-        if extension in {".potx", ".potm"}:
-            flags.open_ppt = True
-        if extension in {".xltx", ".xltm"}:
-            flags.open_excel = True
-        if destination_root == DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH:
-            flags.open_custom_word_folder = True
-        if destination_root == DEFAULT_POWERPOINT_TEMPLATE_PATH or destination_root == DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH:
-            flags.open_custom_ppt_folder = True
-        if destination_root == DEFAULT_EXCEL_TEMPLATE_PATH or destination_root == DEFAULT_CUSTOM_OFFICE_ADDITIONAL_TEMPLATE_PATH:
-            flags.open_custom_excel_folder = True
-        if destination_root == DEFAULT_ROAMING_TEMPLATE_FOLDER:
-            flags.roaming_selection = destination_root / filename
-            flags.open_roaming_folder = True
-        if destination_root == DEFAULT_EXCEL_STARTUP_FOLDER:
-            flags.excel_startup_selection = destination_root / filename
-            flags.open_excel_startup_folder = True
-        if extension == ".thmx":
-            flags.open_document_theme = True
-            flags.document_theme_selection = destination_root / filename
-        if destination_root in {DEFAULT_CUSTOM_OFFICE_TEMPLATE_PATH, DEFAULT_CUSTOM_OFFICE_ADDITIONAL_TEMPLATE_PATH}:
-            flags.custom_selection = flags.custom_selection or destination_root / filename
+
+def _author_check_for_copy(
+    source: Path,
+    allowed: Iterable[str] | AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    verdicts: dict[Path, AuthorCheckResult] | None,
+    cache: AuthorCache | None,
+) -> tuple[AuthorCheckResult, Optional[bytes]]:
+    """Veredicto de autor para la copia; si hay que abrir el ZIP se hace sobre los bytes que luego se copian."""
+    verdict = (verdicts or {}).get(source)
+    if verdict is not None:
+        return verdict, None
+    if not validation_enabled or source.suffix.lower() == ".thmx":
+        return check_template_author(source, allowed, validation_enabled, design_mode), None
+    cached = cache.lookup(source) if cache is not None else None
+    if cached is not None:
+        policy = compile_author_policy(allowed)
+        properties = lambda: _extended_properties_cached(source, policy, cache)  # noqa: E731
+        return _author_verdict(source, cached[0], cached[1], policy, properties), None
+    data = read_template_bytes(source)
+    if data is None:
+        return check_template_author(source, allowed, validation_enabled, design_mode, cache=cache), None
+    return check_template_bytes(source, data, allowed, validation_enabled, cache), data
 
 
 def remove_installed_templates(destinations: dict[str, Path], design_mode: bool, payload_dir: Path | None = None) -> None:
@@ -575,6 +3005,7 @@ def remove_installed_templates(destinations: dict[str, Path], design_mode: bool,
         destinations["THEMES"]: [],
     }
     failures: list[Path] = []
+    catalog = BackupCatalog()
     for root, files in targets.items():
         for name in files:
             target = normalize_path(root / name)
@@ -589,9 +3020,9 @@ def remove_installed_templates(destinations: dict[str, Path], design_mode: bool,
                 if not target.exists():
                     _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] No existe %s", target)
                     continue
-                backup_existing(target, design_mode)
+                backup_existing(target, design_mode, catalog=catalog)  # con "rename" ya lo saca de su carpeta
                 _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] Eliminando %s", target)
-                target.unlink()
+                target.unlink(missing_ok=True)
                 _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.INFO, "[INFO] Eliminado %s", target)
                 if target.exists():
                     _design_log(
@@ -605,6 +3036,7 @@ def remove_installed_templates(destinations: dict[str, Path], design_mode: bool,
             except OSError as exc:
                 _design_log(DESIGN_LOG_UNINSTALLER, design_mode, logging.WARNING, "[WARN] No se pudo eliminar %s (%s)", target, exc)
                 failures.append(target)
+    catalog.finish(design_mode)
     if failures:
         summary = ", ".join(str(path) for path in failures)
         _design_log(
@@ -729,16 +3161,206 @@ def clear_mru_entries_for_payload(base_dir: Path, destinations: dict[str, Path],
             _clear_mru_for_app(app_label, paths, design_mode)
 
 
-def backup_existing(target_file: Path, design_mode: bool) -> None:
+BACKUP_FOLDER_NAME = "Backups"
+BACKUP_STORE_FOLDER = "store"
+BACKUP_INDEX_NAME = "index.jsonl"
+
+
+class BackupStore:
+    """Backups de una carpeta Backups guardados por contenido.
+
+    Cada versión distinta de un archivo se guarda una sola vez como store/<sha256><ext>;
+    index.jsonl anota (ruta original, fecha) -> blob. Respaldar un archivo que no cambió
+    desde su último backup cuesta un hash y una búsqueda en memoria, sin copia ni línea
+    nueva en el índice.
+    """
+
+    def __init__(self, backup_dir: Path) -> None:
+        self.backup_dir = backup_dir
+        self.store_dir = backup_dir / BACKUP_STORE_FOLDER
+        self.index_path = backup_dir / BACKUP_INDEX_NAME
+        self._latest: dict[str, str] = {}  # ruta original -> sha256 de su último backup
+        self._blobs: Set[str] = set()
+        self._unchanged: Set[str] = set()  # respaldados en esta ejecución sin versión nueva
+        self._lock = threading.Lock()
+        self._load()
+
+    def unchanged_since_last(self, target_file: Path, blob: Path) -> bool:
+        """True si el último backup() de `target_file` no añadió nada (mismo contenido que el anterior)."""
+        with self._lock:
+            return str(target_file) in self._unchanged and self._latest.get(str(target_file)) == blob.stem
+
+    def _load(self) -> None:
+        for record in read_backup_index(self.backup_dir):
+            self._latest[record["original"]] = record["sha256"]
+        try:
+            self._blobs = set(os.listdir(self.store_dir))
+        except OSError:
+            self._blobs = set()
+
+    def backup(self, target_file: Path, strategy: str = "copy") -> tuple[Path, bool, bool]:
+        """Guarda `target_file`; devuelve (blob, True si hubo que escribirlo, True si se movió).
+
+        El hash obliga a leer el archivo igualmente; "rename" (ver place_backup) solo ahorra
+        la escritura del blob. "link" se trata como "copy": un blob enlazado al destino
+        cambiaría si alguien modificara el destino en su sitio.
+        """
+        data = read_template_bytes(target_file)
+        digest = hashlib.sha256(data).hexdigest() if data is not None else _sha256_file(target_file)
+        if digest is None:
+            raise OSError(f"no se pudo leer {target_file}")
+        original = str(target_file)
+        blob = self.store_dir / f"{digest}{target_file.suffix.lower()}"
+        with self._lock:
+            if self._latest.get(original) == digest and blob.name in self._blobs:
+                self._unchanged.add(original)
+                return blob, False, False
+            self._unchanged.discard(original)
+            written = blob.name not in self._blobs and not blob.exists()
+            moved = False
+            if written:
+                ensure_directory(self.store_dir)
+                moved = place_backup(target_file, blob, "copy" if strategy == "link" else strategy, data)
+            self._blobs.add(blob.name)
+            record = {
+                "original": original,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "sha256": digest,
+                "size": len(data) if data is not None else blob.stat().st_size,
+                "blob": f"{BACKUP_STORE_FOLDER}/{blob.name}",
+            }
+            with open(self.index_path, "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._latest[original] = digest
+        return blob, written, moved
+
+
+# Un BackupStore por carpeta Backups y ejecución (se vacía con reset_directory_registry).
+_BACKUP_STORES: dict[Path, BackupStore] = {}
+
+
+def backup_store(backup_dir: Path) -> BackupStore:
+    with _ENSURED_DIRECTORIES_LOCK:
+        store = _BACKUP_STORES.get(backup_dir)
+        if store is None:
+            store = _BACKUP_STORES[backup_dir] = BackupStore(backup_dir)
+        return store
+
+
+def read_backup_index(backup_dir: Path) -> list[dict]:
+    """Registros de Backups/index.jsonl en orden de escritura (se ignoran líneas dañadas)."""
+    records: list[dict] = []
+    try:
+        lines = (backup_dir / BACKUP_INDEX_NAME).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return records
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and {"original", "sha256", "blob"} <= record.keys():
+            records.append(record)
+    return records
+
+
+def place_backup(target_file: Path, backup_path: Path, strategy: str, data: bytes | None = None) -> bool:
+    """Deja en `backup_path` la versión actual de `target_file`; True si `target_file` se movió.
+
+    "rename" mueve el archivo (os.replace, O(1) en el mismo volumen): sirve cuando el
+    destino se va a reescribir o borrar a continuación. "link" crea un enlace duro y deja
+    el destino en su sitio: es lo que usa el modo transaccional, cuyo os.replace final
+    cambia el destino por otro inodo sin tocar el enlazado. Si el sistema no lo permite
+    (otro volumen, FAT32, archivo bloqueado...) se copia, igual que con "copy".
+
+    Nunca se sobrescribe un backup: si `backup_path` ya existe se lanza FileExistsError.
+    """
+    if os.path.lexists(backup_path):
+        raise FileExistsError(errno.EEXIST, "ya existe un backup con ese nombre", str(backup_path))
+    if strategy == "rename":
+        try:
+            os.replace(target_file, backup_path)
+            return True
+        except OSError:
+            pass
+    elif strategy == "link":
+        try:
+            os.link(target_file, backup_path)
+            return False
+        except OSError:
+            pass
+    temp_path = backup_path.with_name(f".{backup_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        if data is not None:
+            temp_path.write_bytes(data)
+            _copy_times(target_file, temp_path)
+        else:
+            shutil.copy2(target_file, temp_path)
+        os.replace(temp_path, backup_path)
+    except OSError:
+        _remove_quietly(temp_path)
+        raise
+    return False
+
+
+def backup_existing(
+    target_file: Path,
+    design_mode: bool,
+    layout: str = DEFAULT_BACKUP_LAYOUT,
+    strategy: str = DEFAULT_BACKUP_STRATEGY,
+    catalog: BackupCatalog | None = None,
+) -> Optional[Path]:
+    """Respalda `target_file` en la carpeta Backups de su directorio.
+
+    Con el formato "store" (por defecto) ver BackupStore; "timestamped" guarda una copia
+    completa "AAAA.MM.DD.HHMMSSmmm-xxxxxx - nombre" por ejecución (el sufijo aleatorio
+    evita que dos instalaciones en el mismo segundo compartan nombre);
+    "archive" deja los backups de la ejecución en un .zip por carpeta (ver BackupCatalog,
+    sin `catalog` se usa "store"). `strategy` se explica en place_backup y `catalog` anota
+    el backup para restore_backups. Con "store" el archivo se lee siempre para calcular
+    su hash; "rename" solo ahorra la escritura del blob.
+    Devuelve la ruta del backup si `target_file` se movió a él (el llamador debe escribir
+    el destino nuevo o restaurarlo).
+    """
     if not target_file.exists():
-        return
-    backup_dir = target_file.parent / "Backups"
+        return None
+    backup_dir = target_file.parent / BACKUP_FOLDER_NAME
     ensure_directory(backup_dir)
-    timestamp = datetime.now().strftime("%Y.%m.%d.%H%M")
-    backup_path = backup_dir / f"{timestamp} - {target_file.name}"
     try:
-        shutil.copy2(target_file, backup_path)
-        _design_log(DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[BACKUP] Copia creada en %s", backup_path)
+        if layout == "archive" and catalog is not None:
+            staged, moved = catalog.stage_archive_member(target_file, strategy)
+            _design_log(DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[BACKUP] %s apartado para %s", target_file, staged.parent)
+            return staged if moved else None
+        if layout == "timestamped":
+            timestamp = datetime.now().strftime("%Y.%m.%d.%H%M%S%f")[:-3]
+            backup_path = backup_dir / f"{timestamp}-{uuid.uuid4().hex[:6]} - {target_file.name}"
+            moved = place_backup(target_file, backup_path, strategy)
+            _design_log(
+                DESIGN_LOG_BACKUP,
+                design_mode,
+                logging.INFO,
+                "[BACKUP] %s en %s",
+                "Movido" if moved else "Copia creada",
+                backup_path,
+            )
+            if catalog is not None:
+                # Movido o enlazado es el propio archivo: se anota sin hash para no leerlo.
+                digest = None if moved or strategy == "link" else _sha256_file(backup_path)
+                catalog.record(target_file, backup_path, layout, digest)
+            return backup_path if moved else None
+        store = backup_store(backup_dir)
+        blob, written, moved = store.backup(target_file, strategy)
+        if written:
+            _design_log(
+                DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[BACKUP] %s en %s", "Movido" if moved else "Copia creada", blob
+            )
+        elif store.unchanged_since_last(target_file, blob):
+            # Igual que su último backup: ni línea en index.jsonl ni entrada en el catálogo.
+            _design_log(DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[BACKUP] %s sin cambios desde su último backup", target_file)
+            return None
+        if catalog is not None:
+            catalog.record(target_file, blob, layout, blob.stem)
+        return blob if moved else None
     except OSError as exc:
         _design_log(
             DESIGN_LOG_BACKUP,
@@ -748,22 +3370,644 @@ def backup_existing(target_file: Path, design_mode: bool) -> None:
             target_file,
             exc,
         )
+        return None
+
+
+def restore_moved_backup(backup_path: Path, target_file: Path) -> None:
+    """Vuelve a poner en su sitio un destino que backup_existing movió y no se pudo reescribir.
+
+    Se copia (no se mueve) para que el backup y su registro en el índice sigan siendo válidos.
+    """
+    if not target_file.exists():
+        shutil.copy2(backup_path, target_file)
+
+
+class BackupCatalog:
+    """Índice de los backups de una ejecución: backup_catalog/<run_id>.jsonl en la carpeta de estado.
+
+    Cada línea guarda ruta original, ruta del backup, tamaño, sha256 e id de la ejecución,
+    así que restaurar una ejecución o un archivo es una búsqueda en estos índices y no un
+    recorrido de las carpetas Backups. Se escribe línea a línea: una ejecución cortada
+    conserva lo anotado hasta entonces. No se crea el archivo si no hubo backups.
+
+    Con el formato "archive" los backups de la ejecución se apartan en
+    Backups/.pending-<run_id>/ y finish() los vuelca en un único Backups/<run_id>.zip por
+    carpeta; en el catálogo quedan como (zip, miembro).
+    """
+
+    def __init__(self, folder: Path | None = None, run_id: str | None = None) -> None:
+        self.folder = folder or DEFAULT_BACKUP_CATALOG_FOLDER
+        # AAAAMMDDTHHMMSS + milisegundos: el orden alfabético es el cronológico.
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')[:-3]}-{uuid.uuid4().hex[:6]}"
+        self.path = self.folder / f"{self.run_id}.jsonl"
+        self.count = 0
+        self._pending: dict[Path, dict[str, tuple[Path, Path]]] = {}  # Backups -> nombre -> (original, apartado)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        original: Path,
+        backup: Path,
+        layout: str,
+        sha256: Optional[str],
+        member: str | None = None,
+        size: int | None = None,
+    ) -> None:
+        mtime_ns = None
+        if member is None:
+            # Tamaño y mtime del backup tal como quedó: restaurar comprueba que no haya cambiado.
+            try:
+                stat = backup.stat()
+                size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            except OSError:
+                pass
+        record = {
+            "run_id": self.run_id,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "original": str(original),
+            "backup": str(backup),
+            "layout": layout,
+            "size": size,
+            "sha256": sha256,
+        }
+        if mtime_ns is not None:
+            record["mtime_ns"] = mtime_ns
+        if member is not None:
+            record["member"] = member
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            ensure_directory(self.folder)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+            self.count += 1
+
+    def stage_archive_member(self, target_file: Path, strategy: str) -> tuple[Path, bool]:
+        """Aparta `target_file` para el .zip de su carpeta Backups; (ruta apartada, True si se movió).
+
+        Si el archivo ya se apartó en esta ejecución se conserva el primero (el estado previo).
+        """
+        backup_dir = target_file.parent / BACKUP_FOLDER_NAME
+        staged = backup_dir / f".pending-{self.run_id}" / target_file.name
+        with self._lock:
+            pending = self._pending.setdefault(backup_dir, {})
+            if target_file.name in pending:
+                return staged, False
+            pending[target_file.name] = (target_file, staged)
+        ensure_directory(staged.parent)
+        try:
+            return staged, place_backup(target_file, staged, strategy)
+        except OSError:
+            with self._lock:
+                pending.pop(target_file.name, None)
+            raise
+
+    def adopt_pending(self, backup_dir: Path) -> int:
+        """Retoma Backups/.pending-<run_id> de una ejecución cortada antes de finish().
+
+        Los archivos apartados conservan el nombre del original, que estaba junto a Backups.
+        Devuelve cuántos quedan pendientes de archivar.
+        """
+        staged_dir = backup_dir / f".pending-{self.run_id}"
+        staged = sorted(path for path in staged_dir.iterdir() if path.is_file())
+        with self._lock:
+            pending = self._pending.setdefault(backup_dir, {})
+            for path in staged:
+                pending.setdefault(path.name, (backup_dir.parent / path.name, path))
+            return len(pending)
+
+    def finish(self, design_mode: bool) -> None:
+        """Escribe los .zip de la ejecución (una sola vez, en streaming) y resume el catálogo.
+
+        Si un .zip no se puede escribir, sus archivos se quedan en .pending-<run_id>.
+        """
+        with self._lock:
+            pending_dirs, self._pending = self._pending, {}
+        for backup_dir, pending in pending_dirs.items():
+            archive_path = backup_dir / f"{self.run_id}.zip"
+            temp_path = archive_path.with_name(archive_path.name + ".tmp")
+            written: list[tuple[Path, str, str, int]] = []
+            try:
+                with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as archive:
+                    for name, (original, staged) in sorted(pending.items()):
+                        if not staged.is_file():
+                            continue
+                        info = zipfile.ZipInfo.from_file(staged, name)
+                        info.compress_type = zipfile.ZIP_DEFLATED
+                        digest = hashlib.sha256()
+                        size = 0
+                        with open(staged, "rb") as source, archive.open(info, "w") as target:
+                            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                                digest.update(chunk)
+                                target.write(chunk)
+                                size += len(chunk)
+                        written.append((original, name, digest.hexdigest(), size))
+                os.replace(temp_path, archive_path)
+            except OSError as exc:
+                _remove_quietly(temp_path)
+                _design_log(
+                    DESIGN_LOG_BACKUP,
+                    design_mode,
+                    logging.WARNING,
+                    "[WARN] No se pudo escribir %s (%s); los backups siguen en %s",
+                    archive_path,
+                    exc,
+                    backup_dir / f".pending-{self.run_id}",
+                )
+                continue
+            for original, name, digest, size in written:
+                self.record(original, archive_path, "archive", digest, member=name, size=size)
+            shutil.rmtree(backup_dir / f".pending-{self.run_id}", ignore_errors=True)
+            _design_log(DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[BACKUP] %s backups en %s", len(written), archive_path)
+        self.log_summary(design_mode)
+
+    def log_summary(self, design_mode: bool) -> None:
+        if self.count:
+            _design_log(
+                DESIGN_LOG_BACKUP,
+                design_mode,
+                logging.INFO,
+                "[BACKUP] Ejecución %s: %s backups anotados en %s",
+                self.run_id,
+                self.count,
+                self.path,
+            )
+
+
+def recover_pending_backups(destinations: dict[str, Path], design_mode: bool) -> int:
+    """Archiva los .pending-<run_id> que dejó una ejecución cortada antes de BackupCatalog.finish().
+
+    Cada carpeta se vuelca en su <run_id>.zip y se anota en el catálogo de esa ejecución,
+    como lo habría hecho finish(). Si el .zip ya existe y está en el catálogo, solo faltaba
+    borrar la carpeta; las carpetas vacías se borran sin más. Devuelve cuántas se recuperaron.
+    """
+    recovered = 0
+    for root in sorted({normalize_path(path) for path in destinations.values()}):
+        backup_dir = root / BACKUP_FOLDER_NAME
+        try:
+            staged_dirs = sorted(path for path in backup_dir.glob(".pending-*") if path.is_dir())
+        except OSError:
+            continue
+        for staged_dir in staged_dirs:
+            run_id = staged_dir.name[len(".pending-"):]
+            archive_path = backup_dir / f"{run_id}.zip"
+            try:
+                catalogued = archive_path.is_file() and any(
+                    entry.get("backup") == str(archive_path) for entry in read_backup_catalog(run_id)
+                )
+            except OSError:
+                catalogued = False
+            catalog = BackupCatalog(run_id=run_id)
+            try:
+                count = 0 if catalogued else catalog.adopt_pending(backup_dir)
+            except OSError as exc:
+                _design_log(
+                    DESIGN_LOG_BACKUP, design_mode, logging.WARNING, "[WARN] No se pudo leer %s (%s)", staged_dir, exc
+                )
+                continue
+            if not count:
+                shutil.rmtree(staged_dir, ignore_errors=True)
+                _design_log(
+                    DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[RECOVERY] %s sin backups pendientes; eliminada", staged_dir
+                )
+                continue
+            _design_log(
+                DESIGN_LOG_BACKUP,
+                design_mode,
+                logging.INFO,
+                "[RECOVERY] %s backups de la ejecución %s sin archivar; se vuelcan en %s",
+                count,
+                run_id,
+                archive_path,
+            )
+            catalog.finish(design_mode)
+            recovered += 1
+    return recovered
+
+
+def list_backup_runs(folder: Path | None = None) -> list[str]:
+    """Ids de las ejecuciones con backups, de la más antigua a la más reciente."""
+    folder = folder or DEFAULT_BACKUP_CATALOG_FOLDER
+    try:
+        return sorted(entry.name[: -len(".jsonl")] for entry in os.scandir(folder) if entry.name.endswith(".jsonl"))
+    except OSError:
+        return []
+
+
+def read_backup_catalog(run_id: str, folder: Path | None = None) -> list[dict]:
+    folder = folder or DEFAULT_BACKUP_CATALOG_FOLDER
+    entries: list[dict] = []
+    with open(folder / f"{run_id}.jsonl", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and {"original", "backup"} <= entry.keys():
+                entries.append(entry)
+    return entries
+
+
+def find_backup_version(original: Path, at: datetime, folder: Path | None = None) -> Optional[dict]:
+    """Backup con el contenido que tenía `original` en el momento `at`.
+
+    Es el primer backup posterior a `at` (lo que había justo antes de que otra ejecución lo
+    reemplazara); None si no hubo ninguno después, es decir, si el archivo actual ya es esa
+    versión. Solo se leen los índices de las ejecuciones posteriores a `at`. Las ejecuciones
+    que encontraron el archivo idéntico a su último backup no lo anotan, así que entre dos
+    versiones distintas se resuelve a la siguiente anotada.
+    """
+    original_key = str(normalize_path(original))
+    stamp = at.strftime("%Y%m%dT%H%M%S")
+    runs = list_backup_runs(folder)
+    first = next((position for position, run_id in enumerate(runs) if run_id[:15] >= stamp), len(runs))
+    # También la anterior: pudo empezar antes de `at` y respaldar algo después.
+    for run_id in runs[max(0, first - 1) :]:
+        for entry in read_backup_catalog(run_id, folder):
+            if entry["original"] == original_key and datetime.fromisoformat(entry["timestamp"]) > at:
+                return entry
+    return None
+
+
+def backup_path_owners(folder: Path | None = None) -> dict[tuple[str, Optional[str]], set[str]]:
+    """(backup, miembro) -> ejecuciones que lo anotan, sin los blobs de "store" (se comparten por contenido)."""
+    owners: dict[tuple[str, Optional[str]], set[str]] = {}
+    for run_id in list_backup_runs(folder):
+        try:
+            entries = read_backup_catalog(run_id, folder)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.get("layout") != "store":
+                owners.setdefault((entry["backup"], entry.get("member")), set()).add(run_id)
+    return owners
+
+
+def restore_backup_entry(
+    entry: dict,
+    design_mode: bool,
+    catalog: BackupCatalog | None = None,
+    owners: dict[tuple[str, Optional[str]], set[str]] | None = None,
+) -> Optional[str]:
+    """Devuelve `entry["backup"]` a `entry["original"]`; None si fue bien o el motivo del fallo.
+
+    Antes se comprueba que el backup siga siendo el anotado (sha256 o, si no lo hay, tamaño
+    y mtime) y que ninguna otra ejecución anote la misma ruta (`owners`, de
+    backup_path_owners); después se respalda el archivo actual (en `catalog`, así la
+    restauración también se puede deshacer).
+    """
+    backup, original = Path(entry["backup"]), Path(entry["original"])
+    if owners is None:
+        owners = backup_path_owners()
+    shared = sorted(owners.get((entry["backup"], entry.get("member")), set()) - {entry.get("run_id")})
+    if shared:
+        return f"la ejecución {', '.join(shared)} anota el mismo backup; pudo sobrescribirse y no se restaura"
+    try:
+        # Se lee y comprueba antes de respaldar el actual: si falla, no se ha tocado nada.
+        if entry.get("member"):
+            with zipfile.ZipFile(backup) as archive:
+                info = archive.getinfo(entry["member"])
+                data = archive.read(info)
+            mtime_ns = _zip_mtime_ns(info)
+        else:
+            data = backup.read_bytes()
+            mtime_ns = backup.stat().st_mtime_ns
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return "el backup ya no existe (¿eliminado por la política de retención?)"
+    if entry.get("sha256"):
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            return "el backup no coincide con el hash anotado"
+    elif entry.get("size") is not None and len(data) != entry["size"]:
+        return "el backup cambió después de anotarse (tamaño distinto); no se restaura"
+    elif entry.get("mtime_ns") is not None and mtime_ns != entry["mtime_ns"]:
+        return "el backup cambió después de anotarse (fecha distinta); no se restaura"
+    layout = entry.get("layout") or DEFAULT_BACKUP_LAYOUT
+    moved_to = backup_existing(original, design_mode, layout, "rename", catalog)
+    try:
+        ensure_parents_and_copy(backup, original, data, mtime_ns=mtime_ns)
+    except OSError as exc:
+        if moved_to is not None:
+            restore_moved_backup(moved_to, original)
+        return str(exc)
+    _design_log(DESIGN_LOG_BACKUP, design_mode, logging.INFO, "[RESTORE] %s restaurado desde %s", original, backup)
+    return None
+
+
+def backup_run_entries(run_id: str, folder: Path | None = None) -> list[dict]:
+    """Un registro por archivo: el primero de la ejecución, con el estado previo a ella."""
+    entries: dict[str, dict] = {}
+    for entry in read_backup_catalog(run_id, folder):
+        entries.setdefault(entry["original"], entry)
+    return list(entries.values())
+
+
+def restore_backup_run(
+    run_id: str,
+    design_mode: bool,
+    folder: Path | None = None,
+) -> tuple[int, list[tuple[str, str]]]:
+    """Deja cada archivo de la ejecución `run_id` como estaba antes de ella.
+
+    Devuelve (restaurados, [(ruta, motivo)] de los que fallaron).
+    """
+    catalog = BackupCatalog(folder)
+    owners = backup_path_owners(folder)
+    restored = 0
+    failures: list[tuple[str, str]] = []
+    for entry in backup_run_entries(run_id, folder):
+        error = restore_backup_entry(entry, design_mode, catalog, owners)
+        if error is None:
+            restored += 1
+        else:
+            failures.append((entry["original"], error))
+    catalog.finish(design_mode)
+    return restored, failures
+
+
+@dataclass
+class BackupRetention:
+    """Límites de las carpetas Backups (0 = sin límite).
+
+    Por defecto no hay ninguno: borrar backups de los usuarios tiene que pedirse
+    (--backup-max-* o BACKUP_MAX_*).
+
+    El backup más reciente de cada archivo se conserva siempre, aunque supere la
+    antigüedad o el tamaño máximos.
+    """
+
+    max_versions: int = DEFAULT_BACKUP_MAX_VERSIONS
+    max_age_days: float = DEFAULT_BACKUP_MAX_AGE_DAYS
+    max_bytes: int = DEFAULT_BACKUP_MAX_BYTES
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_versions > 0 or self.max_age_days > 0 or self.max_bytes > 0
+
+
+@dataclass
+class _BackupVersion:
+    original: str
+    timestamp: datetime
+    size: int
+    path: Optional[Path] = None  # copia "AAAA.MM.DD.HHMM - nombre" o .zip de la ejecución
+    record: Optional[dict] = None  # registro de index.jsonl (formato "store")
+    member: Optional[str] = None  # miembro dentro de `path` (formato "archive")
+
+
+# "AAAA.MM.DD.HHMM - nombre" (formato anterior) o "AAAA.MM.DD.HHMMSSmmm-xxxxxx - nombre".
+_TIMESTAMPED_BACKUP_RE = re.compile(r"^(\d{4}\.\d{2}\.\d{2}\.\d{4})(\d{5})?(?:-[0-9a-f]{6})? - (.+)$")
+_ARCHIVE_BACKUP_RE = re.compile(r"^(\d{8}T\d{9})-[0-9a-f]{6}\.zip$")
+
+
+def enforce_backup_retention(
+    destinations: dict[str, Path],
+    design_mode: bool,
+    retention: BackupRetention | None = None,
+) -> tuple[int, int]:
+    """Aplica `retention` a la carpeta Backups de cada destino; devuelve (archivos, bytes) eliminados.
+
+    Antes se archivan los .pending-<run_id> que hayan quedado, para que cuenten como una
+    ejecución más, y después se limpian los catálogos de las versiones eliminadas. Ambos
+    barridos se hacen aunque no haya límites configurados.
+    """
+    retention = retention or BackupRetention()
+    recover_pending_backups(destinations, design_mode)
+    removed_files = removed_bytes = 0
+    if retention.enabled:
+        for root in sorted({normalize_path(path) for path in destinations.values()}):
+            files, size = prune_backup_folder(root / BACKUP_FOLDER_NAME, retention, design_mode)
+            removed_files += files
+            removed_bytes += size
+    prune_backup_catalogs(design_mode)
+    if removed_files:
+        _design_log(
+            DESIGN_LOG_BACKUP,
+            design_mode,
+            logging.INFO,
+            "[RETENTION] %s backups eliminados; %.1f MiB liberados.",
+            removed_files,
+            removed_bytes / (1024 * 1024),
+        )
+    return removed_files, removed_bytes
+
+
+def prune_backup_catalogs(design_mode: bool, folder: Path | None = None) -> int:
+    """Quita de los catálogos las entradas cuyo backup ya no existe y borra los catálogos vacíos.
+
+    Devuelve cuántas entradas se quitaron. Cada ruta de backup se comprueba una sola vez
+    aunque aparezca en varios catálogos (los blobs de "store" se comparten).
+    """
+    folder = folder or DEFAULT_BACKUP_CATALOG_FOLDER
+    exists: dict[str, bool] = {}
+    removed = 0
+    for run_id in list_backup_runs(folder):
+        path = folder / f"{run_id}.jsonl"
+        try:
+            entries = read_backup_catalog(run_id, folder)
+        except OSError:
+            continue
+        kept = []
+        for entry in entries:
+            backup = entry["backup"]
+            if backup not in exists:
+                exists[backup] = Path(backup).is_file()
+            if exists[backup]:
+                kept.append(entry)
+        if len(kept) == len(entries):
+            continue
+        removed += len(entries) - len(kept)
+        if kept:
+            temp_path = path.with_name(path.name + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                for entry in kept:
+                    handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(temp_path, path)
+        else:
+            _remove_quietly(path)
+    if removed:
+        _design_log(
+            DESIGN_LOG_BACKUP,
+            design_mode,
+            logging.INFO,
+            "[RETENTION] %s entradas de catálogo sin backup eliminadas",
+            removed,
+        )
+    return removed
+
+
+def prune_backup_folder(backup_dir: Path, retention: BackupRetention, design_mode: bool) -> tuple[int, int]:
+    """Una pasada de os.scandir por Backups (y otra por store/) decide qué versiones sobran.
+
+    Sirve para los tres formatos: las copias "AAAA.MM.DD.HHMM - nombre" se borran; en el
+    formato "store" se reescribe index.jsonl sin los registros descartados y se borran
+    los blobs que ya nadie referencia; un .zip de "archive" (del que solo se lee el
+    directorio central) se borra cuando sobran todos sus miembros.
+    """
+    versions: list[_BackupVersion] = []
+    archive_sizes: dict[Path, tuple[int, int]] = {}  # .zip -> (miembros, bytes)
+    try:
+        with os.scandir(backup_dir) as entries:
+            for entry in entries:
+                archive_match = _ARCHIVE_BACKUP_RE.match(entry.name)
+                if archive_match is not None and entry.is_file():
+                    try:
+                        timestamp = datetime.strptime(archive_match.group(1) + "000", "%Y%m%dT%H%M%S%f")
+                        with zipfile.ZipFile(entry.path) as archive:
+                            infos = archive.infolist()
+                        archive_sizes[Path(entry.path)] = (len(infos), entry.stat().st_size)
+                    except (ValueError, OSError, zipfile.BadZipFile):
+                        continue
+                    for info in infos:
+                        versions.append(
+                            _BackupVersion(
+                                str(backup_dir.parent / info.filename),
+                                timestamp,
+                                info.compress_size,
+                                path=Path(entry.path),
+                                member=info.filename,
+                            )
+                        )
+                    continue
+                match = _TIMESTAMPED_BACKUP_RE.match(entry.name)
+                if match is None or not entry.is_file():
+                    continue
+                try:
+                    timestamp = datetime.strptime(match.group(1) + (match.group(2) or "00000"), "%Y.%m.%d.%H%M%S%f")
+                    size = entry.stat().st_size
+                except (ValueError, OSError):
+                    continue
+                versions.append(_BackupVersion(str(backup_dir.parent / match.group(3)), timestamp, size, path=Path(entry.path)))
+    except OSError:
+        return 0, 0
+
+    blob_sizes: dict[str, int] = {}
+    try:
+        with os.scandir(backup_dir / BACKUP_STORE_FOLDER) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    blob_sizes[f"{BACKUP_STORE_FOLDER}/{entry.name}"] = entry.stat().st_size
+    except OSError:
+        pass
+    records = read_backup_index(backup_dir)
+    for record in records:
+        try:
+            timestamp = datetime.fromisoformat(record["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            timestamp = datetime.min
+        versions.append(_BackupVersion(record["original"], timestamp, blob_sizes.get(record["blob"], 0), record=record))
+
+    by_original: dict[str, list[_BackupVersion]] = {}
+    for version in versions:
+        by_original.setdefault(version.original, []).append(version)
+    dropped: list[_BackupVersion] = []
+    candidates: list[_BackupVersion] = []  # descartables por tamaño, de la más antigua a la más reciente
+    cutoff = datetime.now().timestamp() - retention.max_age_days * 86400 if retention.max_age_days > 0 else None
+    for history in by_original.values():
+        history.sort(key=lambda version: version.timestamp, reverse=True)
+        for position, version in enumerate(history[1:], start=1):
+            too_many = retention.max_versions > 0 and position >= retention.max_versions
+            too_old = cutoff is not None and version.timestamp != datetime.min and version.timestamp.timestamp() < cutoff
+            (dropped if too_many or too_old else candidates).append(version)
+
+    blob_refs: dict[str, int] = {}
+    for version in versions:
+        if version.record is not None:
+            blob_refs[version.record["blob"]] = blob_refs.get(version.record["blob"], 0) + 1
+
+    def _release(version: _BackupVersion) -> int:
+        """Bytes que deja de ocupar `version` al descartarla."""
+        if version.record is None:
+            return version.size
+        blob = version.record["blob"]
+        blob_refs[blob] -= 1
+        return blob_sizes.get(blob, 0) if blob_refs[blob] == 0 else 0
+
+    for version in dropped:
+        _release(version)
+    if retention.max_bytes > 0:
+        dropped_ids = {id(version) for version in dropped}
+        total = sum(version.size for version in versions if version.record is None and id(version) not in dropped_ids)
+        total += sum(blob_sizes.get(blob, 0) for blob, count in blob_refs.items() if count > 0)
+        candidates.sort(key=lambda version: version.timestamp)
+        for version in candidates:
+            if total <= retention.max_bytes:
+                break
+            total -= _release(version)
+            dropped.append(version)
+
+    removed_files = removed_bytes = 0
+    dropped_members: dict[Path, int] = {}
+    for version in dropped:
+        if version.path is None:
+            continue
+        size = version.size
+        if version.member is not None:
+            dropped_members[version.path] = dropped_members.get(version.path, 0) + 1
+            members, size = archive_sizes[version.path]
+            if dropped_members[version.path] < members:
+                continue  # el .zip aún guarda versiones vigentes
+        try:
+            version.path.unlink()
+        except OSError:
+            continue
+        removed_files += 1
+        removed_bytes += size
+    dropped_records = {id(version.record) for version in dropped if version.record is not None}
+    if dropped_records:
+        kept = [record for record in records if id(record) not in dropped_records]
+        _rewrite_backup_index(backup_dir, kept)
+    # Blobs sin referencias: los de los registros descartados y los que quedaron huérfanos.
+    referenced = {blob for blob, count in blob_refs.items() if count > 0}
+    for blob, size in blob_sizes.items():
+        if blob in referenced:
+            continue
+        try:
+            (backup_dir / blob).unlink()
+        except OSError:
+            continue
+        removed_files += 1
+        removed_bytes += size
+    if dropped_records or len(referenced) < len(blob_sizes):
+        with _ENSURED_DIRECTORIES_LOCK:
+            _BACKUP_STORES.pop(backup_dir, None)
+    if dropped:
+        _design_log(
+            DESIGN_LOG_BACKUP,
+            design_mode,
+            logging.INFO,
+            "[RETENTION] %s: %s versiones descartadas",
+            backup_dir,
+            len(dropped),
+        )
+    return removed_files, removed_bytes
+
+
+def _rewrite_backup_index(backup_dir: Path, records: list[dict]) -> None:
+    index_path = backup_dir / BACKUP_INDEX_NAME
+    temp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(temp_path, index_path)
+
+
+# (etiqueta, flag de InstallFlags, clave de resolve_template_paths) en orden de apertura
+TEMPLATE_FOLDER_OPENERS = (
+    ("THEME_PATH", "open_theme_folder", "THEME"),
+    ("CUSTOM_WORD_TEMPLATE_PATH", "open_custom_word_folder", "CUSTOM_WORD"),
+    ("CUSTOM_PPT_TEMPLATE_PATH", "open_custom_ppt_folder", "CUSTOM_PPT"),
+    ("CUSTOM_EXCEL_TEMPLATE_PATH", "open_custom_excel_folder", "CUSTOM_EXCEL"),
+    ("ROAMING_TEMPLATE_PATH", "open_roaming_folder", "ROAMING"),
+    ("EXCEL_STARTUP_PATH", "open_excel_startup_folder", "EXCEL"),
+    ("CUSTOM_ADDITIONAL_PATH", "open_custom_excel_folder", "CUSTOM_ADDITIONAL"),
+)
 
 
 def open_template_folders(paths: dict[str, Path], design_mode: bool, flags: InstallFlags | None = None) -> None:
     if not is_windows():
         _design_log(DESIGN_LOG_OPENING, design_mode, logging.INFO, "[WARN] Apertura de carpetas omitida: no es Windows.")
         return
-    ordered = [
-        ("THEME_PATH", "open_theme_folder", paths.get("THEME")),
-        ("CUSTOM_WORD_TEMPLATE_PATH", "open_custom_word_folder", paths.get("CUSTOM_WORD")),
-        ("CUSTOM_PPT_TEMPLATE_PATH", "open_custom_ppt_folder", paths.get("CUSTOM_PPT")),
-        ("CUSTOM_EXCEL_TEMPLATE_PATH", "open_custom_excel_folder", paths.get("CUSTOM_EXCEL")),
-        ("ROAMING_TEMPLATE_PATH", "open_roaming_folder", paths.get("ROAMING")),
-        ("EXCEL_STARTUP_PATH", "open_excel_startup_folder", paths.get("EXCEL")),
-        ("CUSTOM_ADDITIONAL_PATH", "open_custom_excel_folder", paths.get("CUSTOM_ADDITIONAL")),
-    ]
-    for label, flag_name, target in ordered:
+    for label, flag_name, path_key in TEMPLATE_FOLDER_OPENERS:
+        target = paths.get(path_key)
         if target is None:
             continue
         if flags is not None and not getattr(flags, flag_name, False):
@@ -881,6 +4125,275 @@ def _clear_mru_for_app(app_label: str, target_paths: Set[str], design_mode: bool
             _design_log(DESIGN_LOG_MRU, design_mode, logging.WARNING, "[MRU] No se pudo limpiar %s (%s)", mru_path, exc)
 
 
+# --------------------------------------------------------------------------- #
+# Plan de instalación
+# --------------------------------------------------------------------------- #
+
+PLAN_ACTIONS = ("backup", "copy", "skip", "mru", "open_folder", "launch_app")
+
+
+@dataclass
+class PlanOperation:
+    """Una operación del plan.
+
+    `target` es una clave de default_destinations() (backup/copy/skip/mru), de
+    resolve_template_paths() (open_folder) o el ejecutable (launch_app), de modo que el
+    mismo plan sirve para cualquier perfil con la misma payload.
+    """
+
+    action: str
+    target: str = ""
+    filename: str = ""
+    app: str = ""
+    base: bool = False
+    reason: str = ""
+    detail: str = ""
+    fingerprint: Optional[List[int]] = None  # [tamaño, mtime_ns] del origen al generar el plan
+    sha256: str = ""  # contenido validado al generar el plan (solo "copy")
+
+    def as_dict(self) -> dict[str, object]:
+        return {key: value for key, value in self.__dict__.items() if value not in ("", None, False)}
+
+
+@dataclass
+class InstallPlan:
+    base_dir: Path
+    operations: List[PlanOperation] = field(default_factory=list)
+    generated: str = ""
+    policy: str = ""  # AuthorPolicy.digest() con la que se validó la payload
+
+    VERSION = 3
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "version": self.VERSION,
+            "generated": self.generated,
+            "policy": self.policy,
+            "base_dir": str(self.base_dir),
+            "operations": [operation.as_dict() for operation in self.operations],
+        }
+
+    def save(self, path: Path) -> None:
+        ensure_directory(path.parent)
+        path.write_text(json.dumps(self.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "InstallPlan":
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        if raw.get("version") != cls.VERSION:
+            raise ValueError(f"Versión de plan no soportada: {raw.get('version')}")
+        operations = []
+        for item in raw.get("operations", []):
+            operation = PlanOperation(**item)
+            if operation.action not in PLAN_ACTIONS:
+                raise ValueError(f"Operación de plan desconocida: {operation.action}")
+            operations.append(operation)
+        return cls(normalize_path(raw["base_dir"]), operations, raw.get("generated", ""), raw.get("policy", ""))
+
+    def of(self, action: str) -> list[PlanOperation]:
+        return [operation for operation in self.operations if operation.action == action]
+
+
+def compile_install_plan(
+    base_dir: Path,
+    jobs: list[InstallJob],
+    destinations: dict[str, Path],
+    allowed_authors: Iterable[str] | AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    verdicts: dict[Path, AuthorCheckResult] | None = None,
+    cache: AuthorCache | None = None,
+    options: InstallOptions | None = None,
+    workers: int = 1,
+) -> InstallPlan:
+    """Valida la payload y describe lo que haría install_jobs, sin escribir nada.
+
+    El plan solo depende de la payload: backup y "sin cambios" (--incremental) se
+    resuelven al ejecutarlo en cada perfil, así que un plan se puede reutilizar.
+    """
+    policy = compile_author_policy(allowed_authors)
+    options = options or InstallOptions()
+    read_only = InstallOptions(verify_integrity=options.verify_integrity)
+    preview = InstallFlags()
+    plan = InstallPlan(
+        normalize_path(base_dir),
+        generated=datetime.now().isoformat(timespec="seconds"),
+        policy=policy.digest(validation_enabled),
+    )
+
+    def _prepare(job: InstallJob) -> _PreparedJob:
+        return _prepare_install_job(job, policy, validation_enabled, design_mode, verdicts, cache, read_only)
+
+    for prepared in _map_bounded(_prepare, jobs, workers):
+        job = prepared.job
+        target = _destination_key(job, destinations)
+        reason, detail = _skip_reason(prepared)
+        common_fields = {"target": target, "filename": job.filename, "app": job.app_label, "base": job.base}
+        if reason is not None:
+            plan.operations.append(PlanOperation("skip", reason=reason, detail=detail, **common_fields))
+            continue
+        if job.base:
+            plan.operations.append(PlanOperation("backup", **common_fields))
+        fingerprint = job.member.fingerprint if job.member is not None else _file_fingerprint(job.source)
+        digest = hashlib.sha256(prepared.data).hexdigest() if prepared.data is not None else _sha256_file(job.source)
+        plan.operations.append(
+            PlanOperation(
+                "copy", fingerprint=list(fingerprint) if fingerprint else None, sha256=digest or "", **common_fields
+            )
+        )
+        if _job_updates_mru(job):
+            plan.operations.append(PlanOperation("mru", **common_fields))
+        _apply_install_flags(job, preview, destinations)
+
+    for label, flag_name, path_key in TEMPLATE_FOLDER_OPENERS:
+        if getattr(preview, flag_name):
+            plan.operations.append(PlanOperation("open_folder", target=path_key, detail=label))
+    for flag_name, exe, label in OFFICE_APP_LAUNCHES:
+        if getattr(preview, flag_name):
+            plan.operations.append(PlanOperation("launch_app", target=exe, app=label))
+    return plan
+
+
+def execute_install_plan(
+    plan: InstallPlan,
+    destinations: dict[str, Path],
+    flags: InstallFlags,
+    allowed_authors: Iterable[str] | AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    options: InstallOptions | None = None,
+    copy_workers: int = DEFAULT_COPY_WORKERS,
+) -> None:
+    """Ejecuta un plan de compile_install_plan (generado aquí o cargado de disco).
+
+    Los veredictos de autor del plan solo valen con la política que los produjo: si la
+    huella de `allowed_authors` y `validation_enabled` no coincide con la del plan se lanza
+    ValueError sin tocar nada. Solo se copian las operaciones "copy" cuyo origen sigue
+    teniendo el tamaño, mtime y sha256 del momento del plan (si no, cuenta como error): el
+    hash se comprueba sobre los mismos bytes que se copian, así que una plantilla cambiada
+    sin tocar tamaño ni mtime no llega a instalarse. Los "backup" y "mru" se aplican a esas
+    copias. Las carpetas y aplicaciones que el plan no incluye se
+    quitan de `flags`.
+    """
+    if plan.policy != compile_author_policy(allowed_authors).digest(validation_enabled):
+        raise ValueError("el plan se generó con otra política de autores; vuelva a generarlo")
+    options = options or InstallOptions()
+    linker = ContentLinker() if options.dedupe else None
+    checkpoint = InstallCheckpoint.load(design_mode) if options.resumable else None
+    catalog = BackupCatalog()
+    members = load_payload_members(plan.base_dir)
+    backups = {(operation.target, operation.filename) for operation in plan.of("backup")}
+    mru = {(operation.target, operation.filename) for operation in plan.of("mru")}
+    for operation in plan.of("skip"):
+        job = _plan_job(plan, operation, destinations)
+        _count_skipped_job(job, operation.reason, operation.detail, flags, design_mode)
+
+    def _prepared_jobs() -> Iterator[_PreparedJob]:
+        # Generador: el contenido de cada miembro de la payload se lee cuando la copia llega a él.
+        for operation in plan.of("copy"):
+            job = _plan_job(plan, operation, destinations, members)
+            if members is not None:
+                fingerprint = job.member.fingerprint if job.member is not None else None
+            else:
+                fingerprint = _file_fingerprint(job.source)
+            if fingerprint is None:
+                _count_skipped_job(job, "missing", "", flags, design_mode)
+                continue
+            if operation.fingerprint is not None and list(fingerprint) != list(operation.fingerprint):
+                _count_skipped_job(job, "stale", "el origen cambió después de generar el plan", flags, design_mode)
+                continue
+            resumed = _resume_from_checkpoint(job, checkpoint) if checkpoint is not None else None
+            if resumed is not None:
+                yield resumed
+                continue
+            if job.member is not None:
+                try:
+                    data = job.member.read()
+                except (OSError, ValueError, zipfile.BadZipFile) as exc:
+                    yield _PreparedJob(job, _payload_read_error(job, exc))
+                    continue
+            else:
+                data = read_template_bytes(job.source, sys.maxsize)
+                if data is None:
+                    _count_skipped_job(job, "missing", "", flags, design_mode)
+                    continue
+            if operation.sha256 and hashlib.sha256(data).hexdigest() != operation.sha256:
+                _count_skipped_job(job, "stale", "el contenido del origen no es el validado en el plan", flags, design_mode)
+                continue
+            verdict = AuthorCheckResult(True, "Plan", [])
+            prepared = _PreparedJob(
+                job,
+                verdict,
+                data,
+                copy_backend=options.copy_backend,
+                backup_layout=options.backup_layout,
+                backup_strategy=options.backup_strategy,
+                backup=(operation.target, operation.filename) in backups,
+                linker=linker,
+                checkpoint=checkpoint,
+                catalog=catalog,
+            )
+            if options.incremental:
+                prepared.unchanged = destination_unchanged(
+                    job.source, job.destination, prepared.data, job.member.fingerprint if job.member else None
+                )
+            if checkpoint is not None:
+                _verify_in_flight(prepared, checkpoint)
+            yield prepared
+
+    _update_mru = _checkpointed_mru_update(
+        checkpoint, options, design_mode, lambda job: (_destination_key(job, destinations), job.filename) in mru
+    )
+
+    def _run(transaction: InstallTransaction | None, on_copied: Callable[[InstallJob], None] | None) -> None:
+        _commit_in_order(_prepared_jobs(), destinations, flags, design_mode, transaction, on_copied or _update_mru, copy_workers)
+
+    _run_maybe_transactional(_run, options, flags, destinations, design_mode, _update_mru)
+    catalog.finish(design_mode)
+    if checkpoint is not None:
+        checkpoint.finish()
+
+    planned_folders = {operation.target for operation in plan.of("open_folder")}
+    for _label, flag_name, path_key in TEMPLATE_FOLDER_OPENERS:
+        if path_key not in planned_folders:
+            setattr(flags, flag_name, False)
+    planned_apps = {operation.target for operation in plan.of("launch_app")}
+    for flag_name, exe, _label in OFFICE_APP_LAUNCHES:
+        if exe not in planned_apps:
+            setattr(flags, flag_name, False)
+
+
+def _plan_job(
+    plan: InstallPlan,
+    operation: PlanOperation,
+    destinations: dict[str, Path],
+    members: dict[str, PayloadMember] | None = None,
+) -> InstallJob:
+    return InstallJob(
+        operation.app,
+        operation.filename,
+        normalize_path(plan.base_dir / operation.filename),
+        normalize_path(destinations[operation.target]),
+        base=operation.base,
+        member=members.get(operation.filename) if members is not None else None,
+    )
+
+
+def _destination_key(job: InstallJob, destinations: dict[str, Path]) -> str:
+    if job.base:
+        return job.app_label
+    preferred = ("WORD_CUSTOM", "POWERPOINT_CUSTOM", "EXCEL_CUSTOM", "THEMES")
+    for key in (*preferred, *destinations):
+        root = destinations.get(key)
+        if root is not None and normalize_path(root) == job.destination_root:
+            return key
+    raise KeyError(f"Destino sin clave en default_destinations(): {job.destination_root}")
+
+
+def _job_updates_mru(job: InstallJob) -> bool:
+    return _should_update_mru(job.destination) and job.extension in {".dotx", ".dotm", ".potx", ".potm", ".xltx", ".xltm"}
+
+
 # --------------------------------------------------------------------------- #
 # Utilidades plataforma
 # --------------------------------------------------------------------------- #
@@ -913,18 +4426,20 @@ def close_office_apps(design_mode: bool) -> None:
             _design_log(DESIGN_LOG_CLOSE_APPS, design_mode, logging.DEBUG, "[DEBUG] No se pudo verificar %s", exe)
 
 
+OFFICE_APP_LAUNCHES = (
+    ("open_word", "winword.exe", "Microsoft Word"),
+    ("open_ppt", "powerpnt.exe", "Microsoft PowerPoint"),
+    ("open_excel", "excel.exe", "Microsoft Excel"),
+)
+
+
 def launch_office_apps(flags: InstallFlags, design_mode: bool) -> None:
     if not is_windows():
         _design_log(DESIGN_LOG_APP_LAUNCH, design_mode, logging.INFO, "[WARN] Apertura de aplicaciones omitida: no es Windows.")
         return
-    launches = []
-    if flags.open_word:
-        launches.append(("winword.exe", "Microsoft Word"))
-    if flags.open_ppt:
-        launches.append(("powerpnt.exe", "Microsoft PowerPoint"))
-    if flags.open_excel:
-        launches.append(("excel.exe", "Microsoft Excel"))
-    for exe, label in launches:
+    for flag_name, exe, label in OFFICE_APP_LAUNCHES:
+        if not getattr(flags, flag_name):
+            continue
         try:
             _design_log(DESIGN_LOG_APP_LAUNCH, design_mode, logging.INFO, "[ACTION] Lanzando %s", label)
             os.startfile(exe)  # type: ignore[arg-type]
@@ -1203,6 +4718,25 @@ def _rewrite_mru_excluding(mru_path: str, targets: Set[str], design_mode: bool)
             winreg.SetValueEx(key, item_name, 0, winreg.REG_SZ, val)
             if meta_val:
                 winreg.SetValueEx(key, meta_name, 0, winreg.REG_SZ, meta_val)
+
+
+def payload_destination_role(filename: str) -> Optional[tuple[str, str]]:
+    """(aplicación, clave de default_destinations()) a la que va un archivo de la payload."""
+    extension = Path(filename).suffix.lower()
+    if filename in BASE_TEMPLATE_NAMES:
+        app_label = "WORD" if extension in {".dotx", ".dotm"} else "POWERPOINT" if extension in {".potx", ".potm"} else "EXCEL"
+        return app_label, app_label
+    if extension in {".dotx", ".dotm"}:
+        return "WORD", "WORD_CUSTOM"
+    if extension in {".potx", ".potm"}:
+        return "POWERPOINT", "POWERPOINT_CUSTOM"
+    if extension in {".xltx", ".xltm"}:
+        return "EXCEL", "EXCEL_CUSTOM"
+    if extension == ".thmx":
+        return "THEME", "THEMES"
+    return None
+
+
 def _destination_for_extension(extension: str, destinations: dict[str, Path]) -> Optional[Path]:
     if extension in {".dotx", ".dotm"}:
         return destinations["WORD"]
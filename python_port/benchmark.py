@@ -0,0 +1,364 @@
+"""Micro-benchmarks de la ruta de validación de autores y de la copia.
+
+    python benchmark.py core-reader            # plantillas incluidas, lector mínimo vs zipfile
+    python benchmark.py synthetic --output a.json --label v1
+    python benchmark.py compare a.json b.json
+    python benchmark.py copy --size-mb 2 --target /ruta/destino
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import zipfile
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+try:
+    from . import common
+except ImportError:  # pragma: no cover - permite ejecución directa como script
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parent))
+    import common  # type: ignore[no-redef]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks del instalador de plantillas (Python)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    core_reader = subparsers.add_parser(
+        "core-reader",
+        help="Compara el lector mínimo de core.xml con la implementación basada en zipfile.",
+    )
+    core_reader.add_argument(
+        "--payload",
+        type=Path,
+        default=Path(__file__).resolve().parent,
+        help="Carpeta con plantillas (por defecto, las incluidas junto al script).",
+    )
+    core_reader.add_argument("--repeat", type=int, default=200, help="Repeticiones por archivo.")
+
+    synthetic = subparsers.add_parser(
+        "synthetic",
+        help="Genera paquetes OOXML sintéticos y mide _extract_author y check_template_author.",
+    )
+    synthetic.add_argument("--files", type=int, default=20, help="Paquetes generados por caso.")
+    synthetic.add_argument("--repeat", type=int, default=5, help="Pasadas completas por caso.")
+    synthetic.add_argument("--seed", type=int, default=1234, help="Semilla del contenido aleatorio.")
+    synthetic.add_argument("--label", default="", help="Etiqueta libre de la ejecución (versión, rama...).")
+    synthetic.add_argument("--output", type=Path, help="Guarda los resultados en este JSON.")
+    synthetic.add_argument("--keep", type=Path, help="Genera los paquetes en esta carpeta y no la borra.")
+
+    copy = subparsers.add_parser("copy", help="Mide el throughput de cada backend de copia frente a shutil.copy2.")
+    copy.add_argument("--size-mb", type=float, default=2.0, help="Tamaño del archivo de prueba en MiB.")
+    copy.add_argument("--files", type=int, default=20, help="Copias por pasada.")
+    copy.add_argument("--repeat", type=int, default=5, help="Pasadas por backend.")
+    copy.add_argument("--target", type=Path, help="Carpeta de destino (por defecto, una temporal).")
+    copy.add_argument("--output", type=Path, help="Guarda los resultados en este JSON.")
+
+    compare = subparsers.add_parser("compare", help="Compara dos resultados JSON de 'synthetic'.")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("candidate", type=Path)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "core-reader":
+        return bench_core_reader(args.payload, args.repeat)
+    if args.command == "synthetic":
+        return bench_synthetic(args.files, args.repeat, args.seed, args.label, args.output, args.keep)
+    if args.command == "copy":
+        return bench_copy(args.size_mb, args.files, args.repeat, args.target, args.output)
+    if args.command == "compare":
+        return compare_results(args.baseline, args.candidate)
+    return 1
+
+
+def bench_core_reader(payload: Path, repeat: int) -> int:
+    files = sorted(f for f in common.iter_template_files(payload) if f.suffix.lower() != ".thmx")
+    if not files:
+        print(f"[WARN] No se encontraron plantillas en \"{payload}\".")
+        return 1
+
+    implementations: list[tuple[str, Callable[[Path], object]]] = [
+        ("zipfile", lambda file: common._extract_author_zipfile(file)),
+        ("core-reader", common._extract_author),
+    ]
+    print(f"{'archivo':<60} {'KiB':>8} {'zipfile µs':>12} {'core-reader µs':>15} {'x':>6}")
+    totals = {label: 0.0 for label, _ in implementations}
+    for file in files:
+        medians = {}
+        for label, func in implementations:
+            medians[label] = _median_seconds(func, file, repeat)
+            totals[label] += medians[label]
+        speedup = medians["zipfile"] / medians["core-reader"] if medians["core-reader"] else 0.0
+        print(
+            f"{file.name[:60]:<60} {file.stat().st_size / 1024:>8.0f} "
+            f"{medians['zipfile'] * 1e6:>12.1f} {medians['core-reader'] * 1e6:>15.1f} {speedup:>6.2f}"
+        )
+    overall = totals["zipfile"] / totals["core-reader"] if totals["core-reader"] else 0.0
+    print(
+        f"{'TOTAL':<60} {'':>8} {totals['zipfile'] * 1e6:>12.1f} "
+        f"{totals['core-reader'] * 1e6:>15.1f} {overall:>6.2f}"
+    )
+    return 0
+
+
+# --------------------------------------------------------------------------- #
+# Payload sintética
+# --------------------------------------------------------------------------- #
+
+
+@dataclass
+class SyntheticCase:
+    name: str
+    extension: str
+    members: int = 10
+    core_padding: int = 0
+    padding_before_creator: bool = False
+    media_bytes: int = 0
+    with_core: bool = True
+    junk: bool = False
+
+
+SYNTHETIC_CASES = (
+    SyntheticCase("small", ".dotx"),
+    SyntheticCase("many-members", ".potx", members=500),
+    SyntheticCase("large-core", ".xltx", core_padding=256 * 1024),
+    SyntheticCase("large-core-creator-last", ".dotx", core_padding=256 * 1024, padding_before_creator=True),
+    SyntheticCase("media-2mb", ".potx", media_bytes=2 * 1024 * 1024 + 512 * 1024),
+    SyntheticCase("missing-core", ".dotx", with_core=False),
+    SyntheticCase("not-a-zip", ".xltx", junk=True),
+)
+
+_MAIN_PART = {
+    ".dotx": ("word/document.xml", "application/vnd.openxmlformats-officedocument.wordprocessingml.template.main+xml"),
+    ".potx": ("ppt/presentation.xml", "application/vnd.openxmlformats-officedocument.presentationml.template.main+xml"),
+    ".xltx": ("xl/workbook.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.template.main+xml"),
+}
+
+
+def write_synthetic_package(path: Path, case: SyntheticCase, author: str, rng: random.Random) -> None:
+    if case.junk:
+        path.write_bytes(rng.randbytes(64 * 1024))
+        return
+    main_part, main_type = _MAIN_PART[case.extension]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            f'<Override PartName="/{main_part}" ContentType="{main_type}"/></Types>',
+        )
+        package.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="{main_part}"/>'
+            "</Relationships>",
+        )
+        package.writestr(main_part, "<root/>")
+        for index in range(max(0, case.members - 4)):
+            package.writestr(f"customXml/item{index}.xml", f"<item id='{index}'>{rng.random()}</item>")
+        if case.media_bytes:
+            package.writestr("media/image1.bin", rng.randbytes(case.media_bytes), zipfile.ZIP_STORED)
+        if case.with_core:
+            padding = f"<dc:description>{'x' * case.core_padding}</dc:description>" if case.core_padding else ""
+            creator = f"<dc:creator>{author}</dc:creator>"
+            body = padding + creator if case.padding_before_creator else creator + padding
+            package.writestr(
+                "docProps/core.xml",
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+                'xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                f"{body}<cp:lastModifiedBy>{author}</cp:lastModifiedBy></cp:coreProperties>",
+            )
+
+
+def generate_synthetic_payload(root: Path, files_per_case: int, seed: int) -> dict[str, list[Path]]:
+    rng = random.Random(seed)
+    authors = common.DEFAULT_ALLOWED_TEMPLATE_AUTHORS + ["Unauthorized Vendor"]
+    generated: dict[str, list[Path]] = {}
+    for case in SYNTHETIC_CASES:
+        folder = root / case.name
+        folder.mkdir(parents=True, exist_ok=True)
+        generated[case.name] = []
+        for index in range(files_per_case):
+            path = folder / f"{case.name}-{index:04d}{case.extension}"
+            write_synthetic_package(path, case, authors[index % len(authors)], rng)
+            generated[case.name].append(path)
+    return generated
+
+
+def bench_synthetic(files_per_case: int, repeat: int, seed: int, label: str, output: Path | None, keep: Path | None) -> int:
+    root = keep or Path(tempfile.mkdtemp(prefix="template-bench-"))
+    try:
+        payload = generate_synthetic_payload(root, max(1, files_per_case), seed)
+        functions: list[tuple[str, Callable[[Path], object]]] = [
+            ("_extract_author", common._extract_author),
+            ("check_template_author", lambda file: common.check_template_author(file)),
+        ]
+        results = []
+        for case in SYNTHETIC_CASES:
+            files = payload[case.name]
+            total_bytes = sum(file.stat().st_size for file in files)
+            for function_name, func in functions:
+                results.append(_measure_case(case, function_name, func, files, total_bytes, repeat))
+        report = {
+            "label": label,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "files_per_case": files_per_case,
+            "repeat": repeat,
+            "seed": seed,
+            "cases": [asdict(case) for case in SYNTHETIC_CASES],
+            "results": results,
+        }
+    finally:
+        if keep is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{'caso':<26} {'función':<22} {'mediana µs':>11} {'p95 µs':>10} {'MiB/s':>9}")
+    for row in results:
+        print(
+            f"{row['case']:<26} {row['function']:<22} {row['median_us']:>11.1f} "
+            f"{row['p95_us']:>10.1f} {row['throughput_mib_s']:>9.1f}"
+        )
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[OK] Resultados guardados en {output}")
+    return 0
+
+
+def _measure_case(
+    case: SyntheticCase,
+    function_name: str,
+    func: Callable[[Path], object],
+    files: list[Path],
+    total_bytes: int,
+    repeat: int,
+) -> dict[str, object]:
+    for file in files:  # calentamiento
+        func(file)
+    latencies: list[float] = []
+    pass_seconds: list[float] = []
+    for _ in range(max(1, repeat)):
+        pass_start = time.perf_counter()
+        for file in files:
+            start = time.perf_counter()
+            func(file)
+            latencies.append(time.perf_counter() - start)
+        pass_seconds.append(time.perf_counter() - pass_start)
+    latencies.sort()
+    best_pass = min(pass_seconds)
+    return {
+        "case": case.name,
+        "function": function_name,
+        "files": len(files),
+        "bytes": total_bytes,
+        "median_us": statistics.median(latencies) * 1e6,
+        "p95_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1e6,
+        "throughput_mib_s": total_bytes / best_pass / (1024 * 1024) if best_pass else 0.0,
+        "files_per_s": len(files) / best_pass if best_pass else 0.0,
+    }
+
+
+def compare_results(baseline_path: Path, candidate_path: Path) -> int:
+    """Muestra la variación de la mediana por caso; código 1 si alguno empeora más de un 10 %."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    candidate = json.loads(candidate_path.read_text(encoding="utf-8"))
+    previous = {(row["case"], row["function"]): row for row in baseline["results"]}
+    regressions = 0
+    print(f"{'caso':<26} {'función':<22} {'antes µs':>10} {'ahora µs':>10} {'cambio':>8}")
+    for row in candidate["results"]:
+        old = previous.get((row["case"], row["function"]))
+        if old is None or not old["median_us"]:
+            continue
+        change = (row["median_us"] - old["median_us"]) / old["median_us"]
+        marker = " !" if change > 0.10 else ""
+        regressions += change > 0.10
+        print(
+            f"{row['case']:<26} {row['function']:<22} {old['median_us']:>10.1f} "
+            f"{row['median_us']:>10.1f} {change:>+7.1%}{marker}"
+        )
+    return 1 if regressions else 0
+
+
+def bench_copy(size_mb: float, files: int, repeat: int, target: Path | None, output: Path | None) -> int:
+    root = Path(tempfile.mkdtemp(prefix="template-copy-", dir=target))
+    try:
+        source = root / "source.potx"
+        source.write_bytes(random.Random(0).randbytes(int(size_mb * 1024 * 1024)))
+        size = source.stat().st_size
+        candidates: list[tuple[str, Callable[[Path, Path], str]]] = [("shutil.copy2", _copy2_baseline)]
+        candidates += [
+            (backend, lambda src, dst, backend=backend: common.ensure_parents_and_copy(src, dst, backend=backend))
+            for backend in common.COPY_BACKENDS
+        ]
+        results = []
+        for name, copier in candidates:
+            used = set()
+            passes = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                for index in range(max(1, files)):
+                    used.add(copier(source, root / f"copy-{index}.potx"))
+                passes.append(time.perf_counter() - start)
+            best = min(passes)
+            results.append(
+                {
+                    "backend": name,
+                    "used": sorted(used),
+                    "throughput_mib_s": size * files / best / (1024 * 1024) if best else 0.0,
+                    "per_file_us": best / files * 1e6,
+                }
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"{'backend':<18} {'usado':<18} {'µs/archivo':>12} {'MiB/s':>10}")
+    for row in results:
+        print(f"{row['backend']:<18} {','.join(row['used']):<18} {row['per_file_us']:>12.1f} {row['throughput_mib_s']:>10.1f}")
+    if output is not None:
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size_bytes": size,
+            "files": files,
+            "repeat": repeat,
+            "results": results,
+        }
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[OK] Resultados guardados en {output}")
+    return 0
+
+
+def _copy2_baseline(source: Path, destination: Path) -> str:
+    shutil.copy2(source, destination)
+    return "copy2"
+
+
+def _median_seconds(func: Callable[[Path], object], file: Path, repeat: int) -> float:
+    func(file)  # calentamiento: caché del sistema de archivos
+    samples = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func(file)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,7 @@ except ImportError:  # pragma: no cover - permite ejecución directa como script
 def delete_normal_templates() -> None:
     design_mode = common.DEFAULT_DESIGN_MODE
     common.refresh_design_log_flags(design_mode)
+    common.reset_directory_registry()
     if design_mode:
         common.configure_logging(design_mode)
         common.remove_normal_templates(design_mode, emit=print)
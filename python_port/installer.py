@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import json
 import logging
 import os
+import sys
 import time
 from pathlib import Path
 from typing import Iterable
@@ -17,32 +20,255 @@ MANUAL_IS_DESIGN_MODE: bool | None = False
 try:
     from . import common
 except ImportError:  # pragma: no cover - permite ejecución directa como script
-    import sys
-
     sys.path.append(str(Path(__file__).resolve().parent))
     import common  # type: ignore[no-redef]
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Instalador de plantillas de Office (Python)")
     parser.add_argument(
         "--allowed-authors",
         help="Lista separada por ';' de autores permitidos.",
     )
+    parser.add_argument(
+        "--allowed-authors-file",
+        metavar="RUTA",
+        help="Archivo con un autor permitido por línea (admite glob y 're:<regex>'; '#' comenta).",
+    )
+    split_authors = parser.add_mutually_exclusive_group()
+    split_authors.add_argument(
+        "--split-authors",
+        dest="split_authors",
+        action="store_true",
+        default=common.SPLIT_MULTIPLE_AUTHORS,
+        help=(
+            "Separar creadores con varios autores ('a; b', 'a, b', 'a & b', 'a | b', 'a and b', 'a y b') y "
+            "permitirlos si todos lo están. Por defecto el creador debe coincidir completo (SplitMultipleAuthors)."
+        ),
+    )
+    split_authors.add_argument(
+        "--no-split-authors",
+        dest="split_authors",
+        action="store_false",
+        help="Comparar el creador completo aunque SplitMultipleAuthors=true.",
+    )
+    parser.add_argument(
+        "--check-last-modified-by",
+        action="store_true",
+        help="Exigir también que lastModifiedBy sea un autor permitido.",
+    )
+    parser.add_argument(
+        "--allowed-companies",
+        help="Lista separada por ';' de valores permitidos para la propiedad Company.",
+    )
     parser.add_argument(
         "--check-author",
         metavar="RUTA",
-        help="Solo valida autor de archivo/carpeta y termina.",
+        nargs="+",
+        help=(
+            "Solo valida autor de archivo/carpeta y termina. Acepta varias rutas o patrones glob; "
+            "'-' lee rutas desde stdin (una por línea)."
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "jsonl"),
+        help=(
+            "Salida de --check-author: 'text' (TRUE/FALSE) o 'jsonl' (un registro JSON por archivo). "
+            "Por defecto 'text' con una sola ruta y 'jsonl' con varias."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=common.DEFAULT_VALIDATION_JOBS,
+        metavar="N",
+        help=(
+            "Hilos para validar autores. Con N > 1 se valida toda la payload antes de copiar "
+            "(o dentro de la etapa de validación con --pipeline)."
+        ),
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Validar, copiar y actualizar MRU en etapas concurrentes unidas por colas acotadas.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=common.DEFAULT_PIPELINE_QUEUE_SIZE,
+        metavar="N",
+        help="Capacidad de cada cola del modo --pipeline.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--copy-workers",
+        type=int,
+        default=common.DEFAULT_COPY_WORKERS,
+        metavar="N",
+        help="Copias simultáneas por dispositivo o recurso compartido de destino (0 = copia secuencial).",
+    )
+    parser.add_argument(
+        "--copy-backend",
+        choices=common.COPY_BACKENDS,
+        default=common.DEFAULT_COPY_BACKEND,
+        help="Primer método de copia a probar: reflink, copy_file_range, sendfile o buffered (auto = en ese orden).",
+    )
+    parser.add_argument(
+        "--backup-layout",
+        choices=common.BACKUP_LAYOUTS,
+        default=common.DEFAULT_BACKUP_LAYOUT,
+        help=(
+            "Formato de Backups: 'store' (una copia por versión distinta, con índice; lee cada archivo para "
+            "calcular su hash), 'timestamped' (una copia por ejecución) o 'archive' (un .zip comprimido "
+            "por carpeta y ejecución)."
+        ),
+    )
+    parser.add_argument(
+        "--backup-strategy",
+        choices=common.BACKUP_STRATEGIES,
+        default=common.DEFAULT_BACKUP_STRATEGY,
+        help=(
+            "Cómo se respalda un destino antes de reemplazarlo: 'rename' (se mueve a Backups; copia si "
+            "está en otro volumen) o 'copy'. Con el formato 'store' el archivo se lee igualmente para su hash."
+        ),
+    )
+    parser.add_argument(
+        "--backup-max-versions",
+        type=int,
+        default=common.DEFAULT_BACKUP_MAX_VERSIONS,
+        metavar="N",
+        help="Backups que se conservan por archivo al terminar (0 = todos, por defecto; no se borra nada).",
+    )
+    parser.add_argument(
+        "--backup-max-age-days",
+        type=float,
+        default=common.DEFAULT_BACKUP_MAX_AGE_DAYS,
+        metavar="DÍAS",
+        help="Eliminar backups más antiguos (0 = sin límite). El más reciente de cada archivo se conserva siempre.",
+    )
+    parser.add_argument(
+        "--backup-max-bytes",
+        type=int,
+        default=common.DEFAULT_BACKUP_MAX_BYTES,
+        metavar="BYTES",
+        help="Tamaño máximo de cada carpeta Backups; se eliminan primero los backups más antiguos (0 = sin límite).",
+    )
+    parser.add_argument(
+        "--verify-integrity",
+        action="store_true",
+        default=common.DEFAULT_VERIFY_INTEGRITY,
+        help=(
+            "Comprobar el CRC de cada miembro de los paquetes y no instalar los dañados. Cada paquete se lee "
+            "una vez completo en memoria (también los mayores que SINGLE_READ_MAX_BYTES) y se copia desde esos bytes."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=common.DEFAULT_INCREMENTAL_INSTALL,
+        help="No hacer backup, copia ni MRU de los destinos idénticos a la payload (tamaño/mtime y, si hace falta, hash).",
+    )
+    parser.add_argument(
+        "--transactional",
+        action="store_true",
+        default=common.DEFAULT_TRANSACTIONAL_INSTALL,
+        help="Copiar a temporales con fsync y reemplazar todos los destinos al final, con diario para recuperar ejecuciones interrumpidas.",
+    )
+    parser.add_argument(
+        "--resumable",
+        action="store_true",
+        default=common.DEFAULT_RESUMABLE_INSTALL,
+        help="Registrar el progreso en un checkpoint y retomar una instalación interrumpida sin repetir copias ni backups.",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        default=common.DEFAULT_DEDUPE_INSTALL,
+        help="Instalar como enlaces duros las plantillas personalizadas con el mismo contenido en el mismo volumen.",
+    )
+    parser.add_argument(
+        "--payload",
+        metavar="RUTA",
+        help=(
+            "Origen de las plantillas: carpeta, bundle .tplpack o .zip de distribución (se instala sin extraerlo). "
+            "Un bundle indicado aquí se usa aunque haya plantillas sueltas más recientes a su lado."
+        ),
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Mostrar el plan de instalación en JSON (backup, copia, omisión, MRU, carpetas y aplicaciones) sin tocar disco ni registro.",
+    )
+    parser.add_argument(
+        "--plan-output",
+        metavar="RUTA",
+        help="Guardar el plan en RUTA en lugar de mostrarlo (implica --plan).",
+    )
+    parser.add_argument(
+        "--apply-plan",
+        metavar="RUTA",
+        help="Ejecutar un plan guardado con --plan-output en lugar de validar la payload de nuevo.",
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="RUTA",
+        help=f"Manifiesto de la payload (por defecto {common.PAYLOAD_MANIFEST_NAME} en la carpeta base).",
+    )
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Ignorar el manifiesto y validar cada plantilla abriendo el ZIP.",
+    )
+    parser.add_argument(
+        "--manifest-verify",
+        choices=common.MANIFEST_VERIFY_MODES,
+        default=None,
+        help=(
+            "'stat': tamaño + mtime (SHA-256 solo si el mtime cambió); se confía en el veredicto del manifiesto "
+            "para un archivo modificado que conserve tamaño y mtime. 'hash': SHA-256 siempre. Por defecto 'stat', "
+            "o 'hash' con --verify-integrity."
+        ),
+    )
+    parser.add_argument(
+        "--no-author-cache",
+        action="store_true",
+        help="No usar la caché persistente de autores.",
+    )
+    parser.add_argument(
+        "--author-cache-hash",
+        action="store_true",
+        help="Confirmar cada acierto de la caché con el SHA-256 del archivo.",
+    )
+    parser.add_argument(
+        "--clear-author-cache",
+        action="store_true",
+        help="Vaciar la caché de autores antes de validar.",
+    )
+    return parser.parse_args(None if argv is None else list(argv))
 
 
 def main(argv: Iterable[str] | None = None) -> int:
-    args = parse_args()
+    args = parse_args(argv)
     design_mode = _resolve_design_mode()
     common.refresh_design_log_flags(design_mode)
+    common.reset_directory_registry()
     common.configure_logging(design_mode)
 
+    allowed_authors = _resolve_author_policy(args)
+    validation_enabled = common.AUTHOR_VALIDATION_ENABLED
+    author_cache = common.load_author_cache(
+        common.AUTHOR_CACHE_ENABLED and validation_enabled and not args.no_author_cache,
+        verify_hash=args.author_cache_hash,
+    )
+    if author_cache is not None and args.clear_author_cache:
+        author_cache.invalidate()
+
+    if args.check_author:
+        try:
+            return _run_check_author(args, allowed_authors, validation_enabled, design_mode, author_cache)
+        finally:
+            common.save_author_cache(author_cache, design_mode)
+
     resolved_paths = common.resolve_template_paths()
     common.log_registry_sources(design_mode)
     common.log_template_paths(resolved_paths, design_mode)
@@ -57,29 +283,27 @@ def main(argv: Iterable[str] | None = None) -> int:
             "[INFO] Carpeta de plantillas extra EXCEL: %s", resolved_paths["CUSTOM_EXCEL"]
         )
 
-    working_dir = Path.cwd()
-    base_dir = common.resolve_base_directory(working_dir)
+    plan = None
+    if args.apply_plan:
+        try:
+            plan = common.InstallPlan.load(Path(args.apply_plan))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            common.exit_with_error(f"[ERROR] No se pudo leer el plan {args.apply_plan} ({exc})", True)
+        base_dir = plan.base_dir
+    elif args.payload:
+        base_dir = common.resolve_base_directory(common.normalize_path(args.payload))
+    else:
+        working_dir = Path.cwd()
+        base_dir = common.resolve_base_directory(working_dir)
 
-    if base_dir == working_dir and common.path_in_appdata(working_dir):
-        common.exit_with_error(
-            '[ERROR] No se recibió la ruta de las plantillas. Ejecute el instalador desde "1. Pin templates..." para que se le pase la carpeta correcta.',
-            design_mode,
-        )
+        if base_dir == working_dir and common.path_in_appdata(working_dir):
+            common.exit_with_error(
+                '[ERROR] No se recibió la ruta de las plantillas. Ejecute el instalador desde "1. Pin templates..." para que se le pase la carpeta correcta.',
+                design_mode,
+            )
 
-    allowed_authors = _resolve_allowed_authors(args.allowed_authors)
-    validation_enabled = common.AUTHOR_VALIDATION_ENABLED
-
-    if args.check_author:
-        result = common.check_template_author(
-            Path(args.check_author),
-            allowed_authors=allowed_authors,
-            validation_enabled=validation_enabled,
-            design_mode=design_mode,
-        )
-        print(result.as_cli_output())
-        if design_mode and common.DESIGN_LOG_AUTHOR:
-            logging.getLogger(__name__).info(result.message)
-        return 0 if result.allowed else 1
+    if args.plan or args.plan_output:
+        return _emit_install_plan(args, base_dir, allowed_authors, validation_enabled, design_mode, author_cache)
 
     _print_intro(base_dir, design_mode)
     common.close_office_apps(design_mode)
@@ -88,42 +312,72 @@ def main(argv: Iterable[str] | None = None) -> int:
     common.open_template_folders(resolved_paths, design_mode)
     flags = common.InstallFlags()
 
-    # Plantillas base
-    base_targets = [
-        ("WORD", "Normal.dotx", destinations["WORD"]),
-        ("WORD", "Normal.dotm", destinations["WORD"]),
-        ("WORD", "NormalEmail.dotx", destinations["WORD"]),
-        ("WORD", "NormalEmail.dotm", destinations["WORD"]),
-        ("POWERPOINT", "Blank.potx", destinations["POWERPOINT"]),
-        ("POWERPOINT", "Blank.potm", destinations["POWERPOINT"]),
-        ("EXCEL", "Book.xltx", destinations["EXCEL"]),
-        ("EXCEL", "Book.xltm", destinations["EXCEL"]),
-        ("EXCEL", "Sheet.xltx", destinations["EXCEL"]),
-        ("EXCEL", "Sheet.xltm", destinations["EXCEL"]),
-    ]
-
-    for app_label, filename, destination in base_targets:
-        common.install_template(
-            app_label,
-            filename,
-            base_dir,
-            destination,
+    payload_files = sorted(common.iter_template_files(base_dir)) if plan is None else []
+    verdicts = _manifest_verdicts(args, base_dir, payload_files, allowed_authors, validation_enabled, design_mode)
+    if args.jobs > 1 and not args.pipeline and plan is None:
+        pending = [file for file in payload_files if common.normalize_path(file) not in verdicts]
+        verdicts.update(
+            common.validate_templates(
+                pending,
+                allowed_authors=allowed_authors,
+                validation_enabled=validation_enabled,
+                design_mode=design_mode,
+                jobs=args.jobs,
+                cache=author_cache,
+            )
+        )
+
+    # Transacción interrumpida en una ejecución anterior (Office ya está cerrado)
+    common.recover_install_journal(design_mode)
+    common.recover_pending_backups(destinations, design_mode)
+
+    options = _install_options(args)
+    if options.transactional and common.DEFAULT_INSTALL_JOURNAL_PATH.exists():
+        common.exit_with_error(
+            f"[ERROR] No se pudo recuperar la transacción anterior ({common.DEFAULT_INSTALL_JOURNAL_PATH}); "
+            "cierre Office y vuelva a ejecutar el instalador.",
+            True,
+        )
+    if plan is not None:
+        try:
+            common.execute_install_plan(
+                plan,
+                destinations,
+                flags,
+                allowed_authors,
+                validation_enabled,
+                design_mode,
+                options=options,
+                copy_workers=args.copy_workers,
+            )
+        except ValueError as exc:
+            common.exit_with_error(f"[ERROR] No se puede aplicar el plan {args.apply_plan} ({exc})", True)
+    else:
+        # Plantillas base (common.BASE_INSTALL_TARGETS) seguidas de las personalizadas
+        jobs = _collect_install_jobs(base_dir, destinations, design_mode)
+        common.install_jobs(
+            jobs,
             destinations,
             flags,
             allowed_authors,
             validation_enabled,
             design_mode,
+            verdicts=verdicts,
+            cache=author_cache,
+            pipeline=args.pipeline,
+            workers=args.jobs,
+            queue_size=args.queue_size,
+            copy_workers=args.copy_workers,
+            options=options,
         )
-
-    # Plantillas personalizadas
-    common.copy_custom_templates(
-        base_dir=base_dir,
-        destinations=destinations,
-        flags=flags,
-        allowed=allowed_authors,
-        validation_enabled=validation_enabled,
-        design_mode=design_mode,
+    common.log_integrity_throughput(flags, design_mode)
+    common.log_dedup_savings(flags, design_mode)
+    common.enforce_backup_retention(
+        destinations,
+        design_mode,
+        common.BackupRetention(args.backup_max_versions, args.backup_max_age_days, args.backup_max_bytes),
     )
+    common.save_author_cache(author_cache, design_mode)
     common.open_template_folders(resolved_paths, design_mode, flags)
 
     if flags.open_document_theme and common.DEFAULT_DOCUMENT_THEME_DELAY_SECONDS > 0:
@@ -138,16 +392,167 @@ def main(argv: Iterable[str] | None = None) -> int:
 
     if design_mode and common.DESIGN_LOG_INSTALLER:
         logging.getLogger(__name__).info(
-            "[FINAL] Instalación completada. Archivos copiados=%s, errores=%s, bloqueados=%s.",
+            "[FINAL] Instalación completada. Archivos copiados=%s, errores=%s, bloqueados=%s, dañados=%s, sin cambios=%s.",
             flags.totals["files"],
             flags.totals["errors"],
             flags.totals["blocked"],
+            flags.totals["corrupt"],
+            flags.totals["unchanged"],
         )
     else:
         print("Ready")
     return 0
 
 
+def _emit_install_plan(
+    args: argparse.Namespace,
+    base_dir: Path,
+    allowed_authors: common.AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    author_cache: common.AuthorCache | None,
+) -> int:
+    """--plan: solo lecturas; no se cierran aplicaciones ni se guarda la caché de autores."""
+    destinations = common.default_destinations()
+    payload_files = sorted(common.iter_template_files(base_dir))
+    verdicts = _manifest_verdicts(args, base_dir, payload_files, allowed_authors, validation_enabled, design_mode)
+    plan = common.compile_install_plan(
+        base_dir,
+        _collect_install_jobs(base_dir, destinations, design_mode),
+        destinations,
+        allowed_authors,
+        validation_enabled,
+        design_mode,
+        verdicts=verdicts,
+        cache=author_cache,
+        options=_install_options(args),
+        workers=args.jobs,
+    )
+    if args.plan_output:
+        plan.save(Path(args.plan_output))
+        if design_mode and common.DESIGN_LOG_INSTALLER:
+            logging.getLogger(__name__).info("[PLAN] %s operaciones guardadas en %s", len(plan.operations), args.plan_output)
+    else:
+        print(json.dumps(plan.as_dict(), ensure_ascii=False, indent=2))
+    return 0
+
+
+def _collect_install_jobs(base_dir: Path, destinations: dict[str, Path], design_mode: bool) -> list[common.InstallJob]:
+    try:
+        return common.collect_install_jobs(base_dir, destinations, design_mode)
+    except (OSError, ValueError) as exc:
+        common.exit_with_error(f"[ERROR] No se pudo leer la payload {base_dir} ({exc})", True)
+        raise  # exit_with_error termina el proceso
+
+
+def _manifest_verdicts(
+    args: argparse.Namespace,
+    base_dir: Path,
+    payload_files: list[Path],
+    allowed_authors: common.AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+) -> dict[Path, common.AuthorCheckResult]:
+    manifest = None if args.no_manifest or not payload_files else common.load_payload_manifest(
+        base_dir, Path(args.manifest) if args.manifest else None
+    )
+    if manifest is None:
+        return {}
+    return common.validate_with_manifest(
+        manifest,
+        payload_files,
+        allowed_authors=allowed_authors,
+        validation_enabled=validation_enabled,
+        design_mode=design_mode,
+        mode=args.manifest_verify or ("hash" if args.verify_integrity else "stat"),
+    )
+
+
+def _install_options(args: argparse.Namespace) -> common.InstallOptions:
+    return common.InstallOptions(
+        verify_integrity=args.verify_integrity,
+        incremental=args.incremental,
+        transactional=args.transactional,
+        resumable=args.resumable,
+        copy_backend=args.copy_backend,
+        backup_layout=args.backup_layout,
+        backup_strategy=args.backup_strategy,
+        dedupe=args.dedupe,
+    )
+
+
+def _run_check_author(
+    args: argparse.Namespace,
+    allowed_authors: common.AuthorPolicy,
+    validation_enabled: bool,
+    design_mode: bool,
+    author_cache: common.AuthorCache | None,
+) -> int:
+    """Modo --check-author. En modo texto conserva la salida TRUE/FALSE de una sola ruta.
+
+    En modo jsonl el código de salida agrega todos los archivos: 0 si todos están permitidos,
+    1 si alguno fue bloqueado (incluidas las plantillas sin autor o sin core.xml) y 2 si
+    alguno no se pudo leer o analizar.
+    """
+    output_format = args.format
+    if output_format is None:
+        output_format = "text" if len(args.check_author) == 1 and args.check_author[0] != "-" else "jsonl"
+
+    if output_format == "text" and len(args.check_author) == 1 and args.check_author[0] != "-":
+        result = common.check_template_author(
+            Path(args.check_author[0]),
+            allowed_authors=allowed_authors,
+            validation_enabled=validation_enabled,
+            design_mode=design_mode,
+            jobs=args.jobs,
+            cache=author_cache,
+        )
+        print(result.as_cli_output())
+        if design_mode and common.DESIGN_LOG_AUTHOR:
+            logging.getLogger(__name__).info(result.message)
+        return 0 if result.allowed else 1
+
+    exit_code = 0
+    checks = common.iter_author_checks(
+        _expand_check_targets(args.check_author),
+        allowed_authors=allowed_authors,
+        validation_enabled=validation_enabled,
+        design_mode=design_mode,
+        jobs=args.jobs,
+        cache=author_cache,
+    )
+    try:
+        for target, result in checks:
+            if output_format == "jsonl":
+                print(json.dumps(result.as_json_record(target), ensure_ascii=False), flush=True)
+            else:
+                print(f"{result.as_cli_output()}\t{target}", flush=True)
+            if result.error:
+                exit_code = 2
+            elif not result.allowed:
+                exit_code = max(exit_code, 1)
+    except BrokenPipeError:
+        # El lector (p. ej. `| head`) cerró la tubería: se deja de validar sin traza. stdout se
+        # redirige a devnull para que el flush al salir no vuelva a fallar.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return exit_code
+
+
+def _expand_check_targets(raw_targets: Iterable[str]) -> Iterable[Path]:
+    """Expande '-' (stdin), patrones glob y carpetas a la lista de archivos a validar."""
+    for raw in raw_targets:
+        if raw == "-":
+            yield from _expand_check_targets(line.strip() for line in sys.stdin if line.strip())
+            continue
+        matches = sorted(glob.glob(raw, recursive=True)) if glob.has_magic(raw) else [raw]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                yield from sorted(common.iter_template_files(path))
+            else:
+                yield path
+
+
 def _print_intro(base_dir: Path, design_mode: bool) -> None:
     if design_mode and common.DESIGN_LOG_INSTALLER:
         logging.getLogger(__name__).info("[DEBUG] Modo diseño habilitado=true")
@@ -164,6 +569,26 @@ def _resolve_allowed_authors(cli_value: str | None) -> list[str]:
     return [author.strip() for author in raw.split(";") if author.strip()]
 
 
+def _resolve_author_policy(args: argparse.Namespace) -> common.AuthorPolicy:
+    """Compila una sola vez la lista de autores (CLI, archivo o entorno) para toda la ejecución."""
+    authors = _resolve_allowed_authors(args.allowed_authors)
+    if args.allowed_authors_file:
+        try:
+            lines = Path(args.allowed_authors_file).read_text(encoding="utf-8-sig").splitlines()
+        except OSError as exc:
+            common.exit_with_error(f"[ERROR] No se pudo leer {args.allowed_authors_file} ({exc})", True)
+        from_file = [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+        authors = from_file if not (args.allowed_authors or os.environ.get("AllowedTemplateAuthors")) else authors + from_file
+    companies_raw = args.allowed_companies or os.environ.get("AllowedTemplateCompanies")
+    companies = [c.strip() for c in companies_raw.split(";") if c.strip()] if companies_raw else None
+    return common.AuthorPolicy.compile(
+        authors,
+        split_multiple=args.split_authors,
+        check_last_modified_by=args.check_last_modified_by,
+        allowed_companies=companies,
+    )
+
+
 def _resolve_design_mode() -> bool:
     if MANUAL_IS_DESIGN_MODE is not None:
         return bool(MANUAL_IS_DESIGN_MODE)
@@ -0,0 +1,47 @@
+"""Empaqueta una carpeta de plantillas en un bundle templates.tplpack."""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+try:
+    from . import common
+except ImportError:  # pragma: no cover - permite ejecución directa como script
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parent))
+    import common  # type: ignore[no-redef]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Empaqueta la payload de plantillas en un único archivo (Python)")
+    parser.add_argument(
+        "payload",
+        nargs="?",
+        help="Carpeta de plantillas (por defecto se busca desde la carpeta actual).",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="RUTA",
+        help=f"Ruta del bundle (por defecto {common.PAYLOAD_BUNDLE_NAME} dentro de la payload).",
+    )
+    parser.add_argument("--jobs", type=int, default=common.DEFAULT_VALIDATION_JOBS, metavar="N")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    base_dir = Path(args.payload) if args.payload else common.resolve_base_directory(Path.cwd())
+    if common.is_payload_archive(base_dir):
+        print(f"[WARN] \"{base_dir}\" ya es una payload empaquetada (bundle o .zip); indique la carpeta de plantillas.")
+        return 1
+    if not any(common.iter_template_files(base_dir)):
+        print(f"[WARN] No se encontraron plantillas en \"{base_dir}\".")
+        return 1
+    output, count = common.pack_payload(base_dir, Path(args.output) if args.output else None, jobs=args.jobs)
+    print(f"[OK] Bundle con {count} archivos: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Restaura backups de plantillas a partir del catálogo de cada ejecución."""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from . import common
+except ImportError:  # pragma: no cover - permite ejecución directa como script
+    import sys
+
+    sys.path.append(str(Path(__file__).resolve().parent))
+    import common  # type: ignore[no-redef]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Restaura plantillas desde los backups del instalador (Python)")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true", help="Listar las ejecuciones con backups.")
+    action.add_argument(
+        "--run",
+        metavar="ID",
+        help="Dejar todos los archivos de una ejecución como estaban antes de ella ('latest' = la última).",
+    )
+    action.add_argument("--file", metavar="RUTA", help="Restaurar un único archivo (requiere --at).")
+    parser.add_argument(
+        "--at",
+        metavar="FECHA",
+        help="Momento al que volver con --file, en formato ISO (p. ej. 2024-05-01T08:30).",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Mostrar qué se restauraría sin tocar nada.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    design_mode = common.DEFAULT_DESIGN_MODE
+    common.refresh_design_log_flags(design_mode)
+    common.reset_directory_registry()
+    common.configure_logging(design_mode)
+    runs = common.list_backup_runs()
+
+    if args.list:
+        if not runs:
+            print("[INFO] No hay ejecuciones con backups.")
+        for run_id in runs:
+            entries = common.backup_run_entries(run_id)
+            print(f"{run_id}\t{len(entries)} archivos")
+        return 0
+
+    if args.run:
+        run_id = runs[-1] if args.run == "latest" and runs else args.run
+        if run_id not in runs:
+            print(f'[WARN] No existe la ejecución "{args.run}".')
+            return 1
+        if args.dry_run:
+            for entry in common.backup_run_entries(run_id):
+                print(f'{entry["original"]} <- {entry["backup"]}')
+            return 0
+        common.close_office_apps(design_mode)
+        restored, failures = common.restore_backup_run(run_id, design_mode)
+        for original, error in failures:
+            print(f"[ERROR] {original}: {error}")
+        print(f"[OK] Ejecución {run_id}: {restored} archivos restaurados, {len(failures)} con error")
+        return 1 if failures else 0
+
+    if not args.at:
+        print("[WARN] --file requiere --at.")
+        return 1
+    try:
+        at = datetime.fromisoformat(args.at)
+    except ValueError:
+        print(f'[WARN] Fecha no válida: "{args.at}".')
+        return 1
+    entry = common.find_backup_version(Path(args.file), at)
+    if entry is None:
+        print(f'[INFO] "{args.file}" no se ha reemplazado desde {at.isoformat()}: ya es esa versión.')
+        return 0
+    if args.dry_run:
+        print(f'{entry["original"]} <- {entry["backup"]} (ejecución {entry.get("run_id")})')
+        return 0
+    common.close_office_apps(design_mode)
+    catalog = common.BackupCatalog()
+    error = common.restore_backup_entry(entry, design_mode, catalog)
+    catalog.finish(design_mode)
+    if error is not None:
+        print(f'[ERROR] {entry["original"]}: {error}')
+        return 1
+    print(f'[OK] {entry["original"]} restaurado desde {entry["backup"]}')
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -29,6 +29,7 @@ def main(argv: list[str] | None = None) -> int:
     args = parse_args()
     design_mode = _resolve_design_mode()
     common.refresh_design_log_flags(design_mode)
+    common.reset_directory_registry()
     common.configure_logging(design_mode)
     common.close_office_apps(design_mode)
 
@@ -55,6 +56,7 @@ def main(argv: list[str] | None = None) -> int:
         )
     common.log_template_folder_contents(common.resolve_template_paths(), design_mode)
     common.remove_normal_templates(design_mode)
+    common.recover_pending_backups(destinations, design_mode)
     common.remove_installed_templates(destinations, design_mode, base_dir)
     common.delete_custom_copies(base_dir, destinations, design_mode)
     common.clear_mru_entries_for_payload(base_dir, destinations, design_mode)